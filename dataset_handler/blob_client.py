@@ -0,0 +1,43 @@
+import os
+from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient
+from dotenv import load_dotenv
+
+load_dotenv()
+
+connection_string = os.getenv("STORAGE_ACCOUNT_CONNECTION_STRING")
+
+# uploads up to max_single_put_size go out as one put (the sdk buffers them whole); bigger
+# files are sent as max_block_size blocks, so memory per upload stays at a few blocks and
+# the blocks of one file can be uploaded in parallel (see upload_max_concurrency)
+max_single_put_size = 8 * 1024 * 1024
+max_block_size = 8 * 1024 * 1024
+# connections shared by all blob uploads: max_parallel_uploads (32) single puts in file_to_blob.py
+# plus room for the parallel blocks of large files
+blob_pool_size = 64
+
+
+@lru_cache(maxsize=1)
+def get_blob_service_client():
+    # parse the connection string and build the pipeline once; every blob operation of the
+    # run shares this client and its keep-alive session. pool_block makes block uploads wait for a
+    # pooled connection when all blob_pool_size are busy instead of opening throwaway ones
+    blob_session = requests.Session()
+    blob_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=blob_pool_size, pool_block=True)
+    blob_session.mount("https://", blob_adapter)
+    blob_session.mount("http://", blob_adapter)
+    blob_transport = RequestsTransport(session=blob_session, session_owner=False, connection_timeout=10, read_timeout=60)
+    return BlobServiceClient.from_connection_string(
+        connection_string,
+        transport=blob_transport,
+        max_single_put_size=max_single_put_size,
+        max_block_size=max_block_size
+    )
+
+
+@lru_cache(maxsize=None)
+def get_container_client(container_name):
+    return get_blob_service_client().get_container_client(container_name)
@@ -1,7 +1,9 @@
 from azure.search.documents.indexes import SearchIndexerClient
 from azure.search.documents.indexes.models import SearchIndexerDataSourceConnection, SearchIndexerDataContainer
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import ResourceNotFoundError
 import os
+import hashlib
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,5 +23,39 @@ ds_connection = SearchIndexerDataSourceConnection(
     container=ds_container
 )
 
-idxr_client.create_or_update_data_source_connection(ds_connection)
+# hash of the data source definition last pushed from this machine; the update is skipped when
+# nothing changed since then and the service still has the data source as defined here
+data_source_hash_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data_source_hash")
+
+
+def data_source_hash(ds_connection):
+    definition = "\x1f".join([ds_connection.name, ds_connection.type, ds_connection.connection_string or "", ds_connection.container.name, ds_connection.container.query or ""])
+    return hashlib.sha256(definition.encode("utf-8")).hexdigest()
+
+
+def read_last_hash():
+    try:
+        with open(data_source_hash_file) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def data_source_in_service(ds_connection):
+    # the local hash file says nothing about the service: the data source may have been deleted
+    # or edited in the portal since (the connection string comes back redacted, so it is not compared)
+    try:
+        existing = idxr_client.get_data_source_connection(ds_connection.name)
+    except ResourceNotFoundError:
+        return False
+    return existing.type == ds_connection.type and existing.container.name == ds_connection.container.name and existing.container.query == ds_connection.container.query
+
+
+current_hash = data_source_hash(ds_connection)
+if current_hash == read_last_hash() and data_source_in_service(ds_connection):
+    print(f"Data source {ds_connection.name} unchanged, skipping update")
+else:
+    idxr_client.create_or_update_data_source_connection(ds_connection)
+    with open(data_source_hash_file, "w") as f:
+        f.write(current_hash)
 
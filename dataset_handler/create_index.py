@@ -19,6 +19,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# hnsw graph parameters; azure ai search only accepts m in 4..10 and efConstruction / efSearch in 100..1000.
+# a denser graph (m=10) gives better recall, and a smaller efConstruction / efSearch keeps build and query fast
+hnsw_m = int(os.getenv("HNSW_M", "10"))
+hnsw_ef_construction = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+hnsw_ef_search = int(os.getenv("HNSW_EF_SEARCH", "100"))
+
 def create_search_index(endpoint, api_key, index_name):
     # Create a client
     credential = AzureKeyCredential(api_key)
@@ -30,9 +36,9 @@ def create_search_index(endpoint, api_key, index_name):
             HnswAlgorithmConfiguration(
                 name="myHnsw",
                 parameters={
-                    "m": 4,
-                    "efConstruction": 400,
-                    "efSearch": 500,
+                    "m": hnsw_m,
+                    "efConstruction": hnsw_ef_construction,
+                    "efSearch": hnsw_ef_search,
                     "metric": "cosine"
                 }
             )
@@ -1,8 +1,200 @@
 import requests
 import os
 from openpyxl import load_workbook
-from file_to_blob import upload_folder_to_blob
-import time
+from file_to_blob import upload_folder_to_blob, upload_max_concurrency, upload_slots, skip_unchanged_blobs, existing_blobs
+from azure.core.exceptions import AzureError
+import shutil
+import socket
+import threading
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+# number of companies downloaded in parallel (downloads are network bound)
+download_workers = 16
+# seconds to wait for a server to respond before giving up on a file
+download_timeout = 30
+# number of company folders uploaded in parallel (each one runs upload_workers file uploads)
+company_upload_workers = 4
+# keep a local copy of every file (downloaded to disk first, then uploaded); by default the
+# http response is streamed straight into blob storage without touching the disk
+keep_local_copies = False
+# retries per file for connection errors and throttling / server errors, with exponential backoff
+download_retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+
+
+def install_dns_cache():
+    # the sheet points at the same few hosts thousands of times; cache the lookups for the
+    # lifetime of the script so new pooled connections skip getaddrinfo
+    if hasattr(socket.getaddrinfo, "cache_info"):
+        return
+    socket.getaddrinfo = lru_cache(maxsize=1024)(socket.getaddrinfo)
+
+
+# company folders already created by this run, so makedirs runs once per folder
+seen_dirs = set()
+seen_dirs_lock = threading.Lock()
+
+
+def ensure_dir(folder):
+    # download threads share the set, so check-and-create happens under the lock
+    with seen_dirs_lock:
+        if folder not in seen_dirs:
+            os.makedirs(folder, exist_ok=True)
+            seen_dirs.add(folder)
+
+
+def make_download_session(headers) -> requests.Session:
+    install_dns_cache()
+
+    # one keep-alive session shared by all download threads, so each host only pays the TLS handshake once per pooled connection
+    session = requests.Session()
+    session.headers.update(headers)
+    # pool_block makes threads wait for a pooled connection instead of opening throwaway ones
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=download_retries, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def download_company_files(session, destination_folder_name, company_name, xml_url, brsr_url):
+    # Create company-specific folder
+    company_folder = os.path.join(f'{destination_folder_name}', company_name)
+    ensure_dir(company_folder)
+
+    # Create company-specific xml and brsr files
+    xml_filename = os.path.join(company_folder, f"{company_name}.xml")
+    brsr_filename = os.path.join(company_folder, f"{company_name}.pdf")
+
+    # Download xml and brsr files straight into company specific files
+    stream_to_file(session, xml_url, xml_filename)
+    stream_to_file(session, brsr_url, brsr_filename)
+
+    return xml_filename, brsr_filename
+
+
+def stream_to_file(session, url, filename):
+    # stream the body to disk in 1 MB pieces so large BRSR pdfs are never held in memory.
+    # iter_content undoes gzip/deflate content encoding and turns a connection dropped
+    # mid-body into a requests exception, so download_files records the company as failed
+    try:
+        with session.get(url, stream=True, timeout=download_timeout) as response:
+            response.raise_for_status()
+            with open(filename, "wb") as f:
+                for piece in response.iter_content(chunk_size=1 << 20):
+                    f.write(piece)
+    except BaseException:
+        # never leave a truncated file behind: upload_downloaded_files would upload it
+        if os.path.exists(filename):
+            os.remove(filename)
+        raise
+
+
+def stream_company_files_to_blob(session, container_client, company_name, xml_url, brsr_url, existing=None):
+    # same blob layout as upload_folder_to_blob: <company>/<company>.xml and <company>/<company>.pdf
+    virtual_folder_for_blob = company_name.replace(" ", "")
+    xml_blob_name = f"{virtual_folder_for_blob}.xml"
+    brsr_blob_name = f"{virtual_folder_for_blob}.pdf"
+
+    xml_blob_url = stream_to_blob(session, xml_url, container_client, f"{virtual_folder_for_blob}/{xml_blob_name}", existing)
+    brsr_blob_url = stream_to_blob(session, brsr_url, container_client, f"{virtual_folder_for_blob}/{brsr_blob_name}", existing)
+
+    return xml_blob_name, brsr_blob_name, [xml_blob_url, brsr_blob_url]
+
+
+def stream_to_blob(session, url, container_client, blob_path, existing=None):
+    # the source's etag / last-modified of the previous upload are kept in the blob metadata;
+    # sending them back as a conditional get lets the server answer 304 for unchanged files
+    existing_blob = existing.get(blob_path) if existing else None
+    source_version = dict(existing_blob.metadata or {}) if existing_blob is not None else {}
+    conditional_headers = {}
+    if source_version.get("source_etag"):
+        conditional_headers["If-None-Match"] = source_version["source_etag"]
+    if source_version.get("source_last_modified"):
+        conditional_headers["If-Modified-Since"] = source_version["source_last_modified"]
+
+    blob_client = container_client.get_blob_client(blob_path)
+
+    # pipe the download body straight into the blob upload, so the file is never written to disk
+    # (the upload slot is taken first, so no download sits open waiting for one)
+    with upload_slots, session.get(url, headers=conditional_headers, stream=True, timeout=download_timeout) as response:
+        if response.status_code == 304:
+            return blob_client.url
+        response.raise_for_status()
+        response.raw.decode_content = True
+        # Content-Length is the encoded size, so it is only the blob size for unencoded bodies
+        content_length = None if response.headers.get("Content-Encoding") else response.headers.get("Content-Length")
+
+        metadata = {
+            "source_etag": response.headers.get("ETag"),
+            "source_last_modified": response.headers.get("Last-Modified")
+        }
+        metadata = {key: value for key, value in metadata.items() if value}
+
+        # servers that ignore conditional requests: an identical etag still means unchanged,
+        # so the body is never read
+        if metadata.get("source_etag") and metadata.get("source_etag") == source_version.get("source_etag"):
+            return blob_client.url
+
+        blob_client.upload_blob(
+            response.raw,
+            length=int(content_length) if content_length else None,
+            overwrite=True,
+            max_concurrency=upload_max_concurrency,
+            metadata=metadata
+        )
+
+    return blob_client.url
+
+
+def upload_and_remove_company_folder(blob_container_name, company_folder, container_client):
+    urls_uploaded_of_this_company, blobs_uploaded_of_this_company = upload_folder_to_blob(blob_container_name, company_folder, container_client)
+
+    # remove the company folder and its files after uploading to blob storage
+    # (downloads are streamed and closed, so nothing holds the files open anymore)
+    files_removed = sum(1 for _ in os.scandir(company_folder))
+    shutil.rmtree(company_folder, ignore_errors=True)
+
+    return urls_uploaded_of_this_company, blobs_uploaded_of_this_company, files_removed
+
+
+def upload_downloaded_files(parent_folder_name, blob_container_name, container_client):
+    #upload the downloaded files to blob storage and remove the files from the local folder after uploading to blob storage
+    urls_of_files_uploaded = []
+    all_uploaded_blobs = []
+    files_removed = 0
+
+    if not os.path.isdir(parent_folder_name):
+        print(f"Nothing to upload, {parent_folder_name} does not exist")
+        return urls_of_files_uploaded, all_uploaded_blobs
+
+    # scandir hands back the entry type with the name, so no extra stat per entry
+    company_folders = [entry.path for entry in os.scandir(parent_folder_name) if entry.is_dir()]
+
+    # company folders are uploaded concurrently too (each folder already uploads its files in parallel)
+    with ThreadPoolExecutor(max_workers=company_upload_workers) as executor:
+        futures = {
+            executor.submit(upload_and_remove_company_folder, blob_container_name, company_folder, container_client): company_folder
+            for company_folder in company_folders
+        }
+
+        for future in as_completed(futures):
+            urls_uploaded_of_this_company, blobs_uploaded_of_this_company, removed = future.result()
+            urls_of_files_uploaded.extend(urls_uploaded_of_this_company)
+            all_uploaded_blobs.extend(blobs_uploaded_of_this_company)
+            files_removed += removed
+
+            print(f"Uploaded file from {os.path.basename(futures[future])} to blob storage /n URLs is : {urls_uploaded_of_this_company}/n")
+
+    number_of_files_uploaded = len(urls_of_files_uploaded)
+
+    print(f"uploaded {number_of_files_uploaded} files to blob storage /n")
+    print(f"Removed {files_removed} files from the local folder /n")
+
+    return urls_of_files_uploaded, all_uploaded_blobs
 
 
 def download_files(excel_file_path, destination_folder_name, parent_folder_name, limit, blob_container_name, container_client) -> None:
@@ -10,104 +202,64 @@ def download_files(excel_file_path, destination_folder_name, parent_folder_name,
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     
-    all_uploaded_blobs = []
-    urls_of_files_uploaded = [] #to save the urls of the files uploaded to blob storage
-
-    wb = load_workbook(excel_file_path)
+    # read only mode streams the sheet instead of loading every cell into memory
+    wb = load_workbook(excel_file_path, read_only=True, data_only=True)
     ws = wb.active
     
-    company_names = []
-    xml_urls = []
-    brsr_urls = []
     xml_file_names = []
     brsr_file_names = []
     failed_to_download_files = []
 
-    for i in range(0,len(ws["A"])): 
-        company_names.append((ws["A"][i].value))
-        xml_urls.append((ws["E"][i].value))
-        brsr_urls.append((ws["D"][i].value))
-
-    for i, (xml_url, brsr_url) in enumerate(zip(xml_urls, brsr_urls), 0):
-
-        if i == limit:                                             
-          break 
- 
-        try:
-            # Create company-specific folder
-            company_folder = os.path.join(f'{destination_folder_name}', company_names[i])
-            os.makedirs(company_folder, exist_ok=True)
-            
-            # Create company-specific xml and brsr files
-            xml_filename = os.path.join(company_folder, f"{company_names[i]}.xml")
-            brsr_filename = os.path.join(company_folder, f"{company_names[i]}.pdf")
-            xml_file_names.append(xml_filename)
-            brsr_file_names.append(brsr_filename)
-
-            # Download xml and brsr files
-            print(f"Downloading files for {company_names[i]} ({i+1} of {limit})...")
-            xml_response = requests.get(xml_url, headers=headers)
-            brsr_response = requests.get(brsr_url, headers=headers)     
-
-            xml_response.raise_for_status()
-            brsr_response.raise_for_status()
-            
-            # Save in company specific files
-            with open(xml_filename, "wb") as f:
-                f.write(xml_response.content)
-            with open(brsr_filename, "wb") as f:
-                f.write(brsr_response.content)
-
-            print(f"Downloaded files for {company_names[i]} ({i+1} of {limit})...")
-
-            # if i % 10 == 0 and i != 0:
-            if i == 9:
-            #upload the files to blob storage after 10 files are downloaded and remove the files from the local folder after uploading to blob storage
-
-                files_removed = 0
-
-                for company in os.listdir(parent_folder_name):
-                    company_folder = os.path.join(parent_folder_name, company)
-
-                    urls_uploaded_of_this_company, blobs_uploaded_of_this_company = upload_folder_to_blob(blob_container_name, company_folder, container_client)
+    # single pass over the rows we need (the sheet has no header row): A = company, D = brsr url, E = xml url
+    # max_col=5 stops the reader at column E instead of materializing every trailing column;
+    # each row becomes one (company, xml url, brsr url) task
+    rows = ws.iter_rows(min_row=1, max_col=5, values_only=True)
+    tasks = [(company_name, xml_url, brsr_url) for company_name, _, _, brsr_url, xml_url in islice(rows, limit)]
+    wb.close()
+
+    company_names = [company_name for company_name, _, _ in tasks]
+    session = make_download_session(headers)
+    # one listing of the container up front, so unchanged files can be skipped on re-runs
+    existing = existing_blobs(container_client) if skip_unchanged_blobs and not keep_local_copies else None
+
+    urls_of_files_uploaded = []
+    all_uploaded_blobs = []
+
+    # download all companies concurrently; as_completed so one slow or failing company doesn't block the rest
+    with ThreadPoolExecutor(max_workers=download_workers) as executor:
+        if keep_local_copies:
+            futures = {
+                executor.submit(download_company_files, session, destination_folder_name, *task): i
+                for i, task in enumerate(tasks)
+            }
+        else:
+            futures = {
+                executor.submit(stream_company_files_to_blob, session, container_client, *task, existing): i
+                for i, task in enumerate(tasks)
+            }
 
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                if keep_local_copies:
+                    xml_filename, brsr_filename = future.result()
+                else:
+                    xml_filename, brsr_filename, urls_uploaded_of_this_company = future.result()
                     urls_of_files_uploaded.extend(urls_uploaded_of_this_company)
-                    all_uploaded_blobs.extend(blobs_uploaded_of_this_company)
-
-                    print(f"Uploaded file from {company} to blob storage /n URLs is : {urls_uploaded_of_this_company}/n")
-
-                    # remove the files from the local folder after uploading to blob storage
-                    max_retries = 3
-                    retry_delay = 0.5  # seconds
-
-                    for file in os.listdir(company_folder):
-                        file_path_to_remove = os.path.join(company_folder, file)
-                        for attempt in range(max_retries):
-                            try:
-                                os.remove(file_path_to_remove)
-                                files_removed += 1
-                                print(f"Successfully removed {file_path_to_remove}")
-                                break  # Exit retry loop on success
-                            except PermissionError as e:
-                                print(f"Attempt {attempt + 1} of {max_retries} failed to remove {file_path_to_remove}: {e}")
-                                if attempt < max_retries - 1:
-                                    time.sleep(retry_delay)
-                                else:
-                                    print(f"❌ Failed to remove {file_path_to_remove} after {max_retries} attempts.")
-                            except Exception as e: # Catch other potential errors during removal
-                                print(f"❌ An unexpected error occurred while trying to remove {file_path_to_remove}: {e}")
-                                break # Exit retry loop for other errors
-                    
-                    #remove the company folder after uploading to blob storage
-                    os.rmdir(company_folder)
-
-                number_of_files_uploaded = len(urls_of_files_uploaded)
-
-                print(f"uploaded {number_of_files_uploaded} files to blob storage /n")
-                print(f"Removed {files_removed} files from the local folder /n")
-
-        except requests.RequestException as e:
-            failed_to_download_files.append(company_names[i])
-            print(f"❌ Error downloading files for {company_names[i]}: {str(e)}")
+                    all_uploaded_blobs.extend([xml_filename, brsr_filename])
+                xml_file_names.append(xml_filename)
+                brsr_file_names.append(brsr_filename)
+                print(f"Downloaded files for {company_names[i]} ({i+1} of {limit})...")
+            # upload_blob reads response.raw directly, so a connection dropped mid-body
+            # surfaces as a urllib3 error (ProtocolError, ReadTimeoutError) rather than a requests one
+            except (requests.RequestException, Urllib3HTTPError, AzureError) as e:
+                failed_to_download_files.append(company_names[i])
+                print(f"❌ Error downloading files for {company_names[i]}: {str(e)}")
+
+    #upload the local copies to blob storage once all downloads are done
+    if keep_local_copies:
+        urls_of_files_uploaded, all_uploaded_blobs = upload_downloaded_files(parent_folder_name, blob_container_name, container_client)
+    else:
+        print(f"uploaded {len(urls_of_files_uploaded)} files to blob storage /n")
 
     return company_names, xml_file_names, brsr_file_names, urls_of_files_uploaded, all_uploaded_blobs, failed_to_download_files
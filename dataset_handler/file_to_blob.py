@@ -1,50 +1,116 @@
 import os
+import mmap
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from azure.core.exceptions import ResourceExistsError
+from azure.storage.blob import ContentSettings
+from blob_client import get_container_client, max_single_put_size
 
 load_dotenv()
 
-def upload_folder_to_blob(blob_container_name, local_company_folder_path, container_client):
+# number of files of one company folder uploaded in parallel
+upload_workers = 8
+# parallel Put Block requests within one file (only used for files larger than a single put,
+# e.g. 20-50 MB BRSR pdfs)
+upload_max_concurrency = 8
+# cap on blob uploads in flight across all companies and threads. a single put uses one
+# connection, so these fit the shared pool in blob_client.py; the blocks of large files use up
+# to upload_max_concurrency connections each and wait for a pooled one when the pool is busy
+max_parallel_uploads = 32
+upload_slots = threading.BoundedSemaphore(max_parallel_uploads)
+# files that go out in a single put are memory-mapped and handed to the SDK as one buffer
+mmap_max_size = max_single_put_size
+# skip files whose blob already exists with the same content (md5 for local files, the source
+# etag / last-modified for streamed downloads), so re-runs only upload what changed
+skip_unchanged_blobs = True
+
+
+def ensure_container(container_client):
+    # create the container once at startup; every later upload can assume it exists
+    try:
+        container_client.create_container()
+    except ResourceExistsError:
+        print(f"Container '{container_client.container_name}' already exists. Proceeding to use it. \n")
+
+
+def existing_blobs(container_client, prefix=None):
+    # one paginated listing (properties and metadata) instead of a request per file
+    return {blob.name: blob for blob in container_client.list_blobs(name_starts_with=prefix, include=["metadata"])}
+
+
+def file_md5(file_path_on_disk):
+    # md5 of the local file, compared against the content_md5 stored on the blob
+    digest = hashlib.md5()
+    with open(file_path_on_disk, "rb") as f:
+        for piece in iter(lambda: f.read(1 << 20), b""):
+            digest.update(piece)
+    return digest.digest()
+
+
+def _upload_one(container_client, virtual_folder_for_blob, file_path_on_disk, existing=None):
+    # Prepare blob name (remove spaces from filename)
+    blob_name_in_virtual_folder = os.path.basename(file_path_on_disk).replace(" ", "")
+    # Construct full blob path using the virtual folder for blob
+    full_blob_path = virtual_folder_for_blob + blob_name_in_virtual_folder
+
+    blob_client = container_client.get_blob_client(full_blob_path)
+
+    # a known length lets the SDK choose single put vs blocks without seeking the file
+    file_size = os.path.getsize(file_path_on_disk)
+
+    # the md5 is stored on every upload (block uploads don't get one from the service), so an
+    # unchanged file is recognised by its content, not just its size
+    content_md5 = file_md5(file_path_on_disk)
+    existing_blob = existing.get(full_blob_path) if existing else None
+    if existing_blob is not None and existing_blob.content_settings.content_md5 == content_md5:
+        return blob_client.url, blob_name_in_virtual_folder
+    content_settings = ContentSettings(content_md5=content_md5)
+
+    with upload_slots, open(file_path_on_disk, "rb") as data:
+        # print(f"Uploading {filename} to blob storage... \n")
+        if 0 < file_size <= mmap_max_size:
+            # small files (most of the xmls) are read straight from the page cache by the
+            # SDK instead of through many small read() calls
+            with mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # a single put is one request, so it only needs one connection
+                blob_client.upload_blob(mapped, length=file_size, overwrite=True, max_concurrency=1, content_settings=content_settings)
+        else:
+            blob_client.upload_blob(data, length=file_size, overwrite=True, max_concurrency=upload_max_concurrency, content_settings=content_settings)
+
+    return blob_client.url, blob_name_in_virtual_folder
+
+def upload_folder_to_blob(blob_container_name, local_company_folder_path, container_client=None):
+    # fall back to the shared per-process client instead of building one per folder
+    container_client = container_client or get_container_client(blob_container_name)
     
     # Derive the virtual folder name for blob storage from the base name of the local_company_folder_path
     virtual_folder_base_name = os.path.basename(local_company_folder_path).replace(" ", "")
     virtual_folder_for_blob = f"{virtual_folder_base_name}/"  # Ends with a slash
 
-    # Commented out because we just created the container in the main_DB.py file no need to check if it exists
-    try:
-        # print(f"Attempting to ensure container '{blob_container_name}' exists.../n")
-        container_client.create_container()
-        # print(f"Container '{blob_container_name}' created successfully or was already ready./n")
-    except ResourceExistsError:
-        print(f"Container '{blob_container_name}' already exists. Proceeding to use it. \n")
-    # Note: Other exceptions during create_container() will now propagate, 
-    # rather than being caught by a general 'except Exception: pass'.
+    # The container is created once by ensure_container() in main_DB.py, not per folder
 
-    # Create a folder marker in blob storage using the derived virtual folder name
-    folder_blob_client = container_client.get_blob_client(virtual_folder_for_blob)
-    folder_blob_client.upload_blob(b'', overwrite=True)
+    # No folder marker blob: blob storage has a flat namespace, so the virtual folder exists
+    # as soon as the first "<folder>/<file>" blob is uploaded
 
     uploaded_urls = []
     blob_names = []
     
-    # Iterate over files in the original local directory
-    for filename in os.listdir(local_company_folder_path): # Use the original full path
-        file_path_on_disk = os.path.join(local_company_folder_path, filename) # Use original full path to build disk path
-        
-        if os.path.isfile(file_path_on_disk):
-            # Prepare blob name (remove spaces from filename)
-            blob_name_in_virtual_folder = filename.replace(" ", "")
+    # Collect the files in the original local directory
+    # (scandir returns the file type with each entry, so there is no stat call per file)
+    with os.scandir(local_company_folder_path) as entries:
+        file_paths_on_disk = [entry.path for entry in entries if entry.is_file(follow_symlinks=False)]
+
+    existing = existing_blobs(container_client, virtual_folder_for_blob) if skip_unchanged_blobs else None
+
+    # the uploads are independent network bound PUTs, so run them concurrently
+    with ThreadPoolExecutor(max_workers=upload_workers) as executor:
+        futures = [executor.submit(_upload_one, container_client, virtual_folder_for_blob, path, existing) for path in file_paths_on_disk]
+        for future in as_completed(futures):
+            url, blob_name_in_virtual_folder = future.result()
+            uploaded_urls.append(url)
             blob_names.append(blob_name_in_virtual_folder)
-            # Construct full blob path using the virtual folder for blob
-            full_blob_path = virtual_folder_for_blob + blob_name_in_virtual_folder
-            
-            blob_client = container_client.get_blob_client(full_blob_path)
-            
-            with open(file_path_on_disk, "rb") as data:
-                # print(f"Uploading {filename} to blob storage... \n")
-                blob_client.upload_blob(data, overwrite=True)
-            
-            uploaded_urls.append(blob_client.url)
 
     return uploaded_urls, blob_names
 
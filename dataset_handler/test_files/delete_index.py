@@ -1,5 +1,7 @@
 from azure.core.credentials import AzureKeyCredential
 from azure.search.documents.indexes import SearchIndexClient
+from azure.core.exceptions import ResourceNotFoundError
+from concurrent.futures import ThreadPoolExecutor
 import os
 from dotenv import load_dotenv
 
@@ -13,7 +15,13 @@ client   = SearchIndexClient(endpoint, AzureKeyCredential(api_key))
 # 2) Delete the index by name
 index_names = ["kliuutllllllllllllllllllliutyilyuliyuh","kliutliutyilyuliyuh","kliuutliutyilyuliyuh","your-index-name"]
 
-for index_name in index_names:
-    
-    client.delete_index(index_name)  # Deletes the index and its documents unconditionally
-    print(f"Index '{index_name}' deleted.")
\ No newline at end of file
+def delete_index(index_name):
+    try:
+        client.delete_index(index_name)  # Deletes the index and its documents unconditionally
+        print(f"Index '{index_name}' deleted.")
+    except ResourceNotFoundError:
+        print(f"Index '{index_name}' does not exist, skipping.")
+
+# the deletes are independent REST calls, so issue them all at once
+with ThreadPoolExecutor(max_workers=len(index_names)) as executor:
+    list(executor.map(delete_index, index_names))
@@ -11,7 +11,6 @@ Dependencies:
 - agents/worker_agent.py: Individual question processing (via sub_question_handler)
 - tools/conv_handler.py: Conversation history management
 - tools/conv_to_pdf_handler.py: PDF generation and upload
-- tools/json_parseing.py: LLM response parsing
 - prompts/*.txt: System prompts for each agent type
 
 External Dependencies:
@@ -20,37 +19,144 @@ External Dependencies:
 - MongoDB: Conversation persistence via tools/conv_handler.py
 """
 
-import json
-from agents.worker_agent import worker
+import logging
 import os
 import uuid
 import asyncio
-from typing import List, Dict, Any, Tuple
-from openai import AsyncAzureOpenAI
+import re
+import random
+import functools
+import orjson
+from typing import List, Dict, Any, Tuple, Optional, Union, AsyncIterator, Awaitable, Callable
+from openai import AsyncAzureOpenAI, RateLimitError
 from motor.motor_asyncio import AsyncIOMotorCollection
 from azure.search.documents import SearchClient
-from tools.conv_handler import get_agents_conv_history, inserting_agent_chat_buffer, monolog, get_best_worker_response, get_agents_total_conv_history
-from tools.conv_to_pdf_handler import conversation_to_pdf, upload_pdf_to_blob
-from tools.json_parseing import parse_json_from_model_response
-from agents.director_agent import director
-from agents.sub_question_handler import process_sub_question
+from tools.conv_handler import format_agent_exchange, inserting_agent_chat_buffer_bulk
+from tools.tokens import trim_history_to_budget
+from tools.history_summary import with_history_summary
+from agents.director_agent import director, director_stream, synthesize_response
+from agents.sub_question_handler import process_sub_question, process_sub_question_batch
 from dotenv import load_dotenv
-from azure.search.documents import SearchClient
 from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import RequestsTransport
+import requests
+from requests.adapters import HTTPAdapter
 
 # Load environment variables for API keys and configuration
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Configuration parameters
 
 
 limit_subquestions = 10
 top_k = 10
 
+# The manager only returns a short JSON list, so its token budget scales with the
+# sub-question limit (~40 tokens per sub-question) instead of a fixed 800
+manager_max_tokens = max(256, 40 * limit_subquestions)
+
+# Sub-questions processed at once per process, so a burst of requests cannot exceed
+# the Azure OpenAI rate limit; a worker hitting a 429 anyway is retried with backoff
+subquestion_concurrency = int(os.getenv("SUBQ_CONCURRENCY", "5"))
+subquestion_semaphore = asyncio.Semaphore(subquestion_concurrency)
+subquestion_max_attempts = 5
+
+# Opt-in: answer this many sub-questions with one worker completion (one search each,
+# one LLM round-trip per group); 1 keeps a separate completion per sub-question
+worker_batch_size = max(1, int(os.getenv("WORKER_BATCH_SIZE", "1")))
+
+# Token budget for the previous conversation sent to the manager and the director;
+# the oldest turns are dropped first once a conversation outgrows it
+history_token_budget = int(os.getenv("HISTORY_TOKEN_BUDGET", "3000"))
+# The director already gets the worker answers, which are built from the resolved
+# sub-questions, so it only needs the latest turns for conversational continuity
+director_history_token_budget = int(os.getenv("DIRECTOR_HISTORY_TOKEN_BUDGET", "1000"))
+
+# Prompt caching: Azure caches the longest identical prefix of a prompt, so the
+# system message must stay first and byte-for-byte identical across calls.
+# prompt_cache_key additionally routes requests sharing a prefix to the same cache;
+# it is only sent when enabled because older API versions reject unknown arguments.
+prompt_cache_key_enabled = os.getenv("AZURE_OPENAI_PROMPT_CACHE_KEY", "false").lower() == "true"
+MANAGER_PROMPT_CACHE_KEY = "esg_manager_v1"
+
+# Tool-calling mode: one director conversation decides the worker searches itself via
+# the search_company_esg tool, replacing the separate manager decomposition call
+tool_calling_enabled = os.getenv("AGENTIC_TOOL_CALLING", "false").lower() == "true"
+TOOL_CALLING_PROMPT_CACHE_KEY = "esg_tool_calling_v1"
+SEARCH_COMPANY_ESG_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "search_company_esg",
+        "description": "Search one company's ESG disclosures (BRSR, XBRL and sustainability reports) and answer a focused question about it.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "company": {"type": "string", "description": "Exact full company name, no abbreviations"},
+                "question": {"type": "string", "description": "Focused question about this single company, enriched with report topic names"}
+            },
+            "required": ["company", "question"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Fast path configuration: short single-company questions skip the manager LLM call
+fast_path_max_prompt_length = 200
+fast_path_company_aliases = {
+    "hpcl": "Hindustan Petroleum Corporation Limited",
+    "hindustan petroleum": "Hindustan Petroleum Corporation Limited",
+    "iocl": "Indian Oil Corporation Limited",
+    "indian oil": "Indian Oil Corporation Limited",
+}
+_COMPANY_ALIAS_RE = re.compile(r"\b(" + "|".join(fast_path_company_aliases) + r")\b", re.IGNORECASE)
+_MULTI_PART_RE = re.compile(r"\b(and|vs|versus|compare|comparison)\b", re.IGNORECASE)
+
+# No-data short circuit: when every worker came back empty there is nothing for the
+# director to synthesize, so a canned answer is returned instead of another LLM call.
+# Only short answers are matched against the regex, because a long answer that says
+# "not found" usually goes on to give the closest available information. An answer
+# with any figure in it (even a one-liner like "HPCL Scope 1 FY23: 3.2 MtCO2e.") is
+# never treated as empty; the length rule alone only catches near-empty text.
+_NO_DATA_RESPONSE = (
+    "I don't have data on that in the ESG reports I can search. "
+    "Try asking about Hindustan Petroleum Corporation Limited (HPCL) or Indian Oil Corporation Limited (IOCL)."
+)
+_EMPTY_RESPONSE_MAX_LENGTH = 10
+_NO_DATA_CHECK_MAX_LENGTH = 300
+_NO_DATA_RE = re.compile(r"(?i)no (relevant )?information|not found|cannot find")
+_WHITESPACE_RE = re.compile(r"\s+")
+_DIGIT_RE = re.compile(r"\d")
+
+# Structured output schema for the manager decomposition call: the model is
+# constrained to this exact JSON shape, so the output parses on the first attempt.
+# Strict mode does not accept maxItems, so the sub-question limit is enforced after parsing.
+MANAGER_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "manager_decomposition",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "list_of_sub_questions": {"type": "array", "items": {"type": "string"}},
+                "company_names": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["list_of_sub_questions", "company_names"],
+            "additionalProperties": False
+        }
+    }
+}
+
 # Load system prompts from text files
+@functools.lru_cache(maxsize=None)
 def load_prompt_from_file(file_path: str) -> str:
     """
     Load prompt content from a text file with UTF-8 encoding
+
+    Cached per path, so every agent sharing a prompt reads the file only once
+    per process.
     
     Args:
         file_path (str): Path to the prompt file in prompts/ directory
@@ -69,16 +175,156 @@ def load_prompt_from_file(file_path: str) -> str:
 # Load system prompts for each agent type
 # These prompts define the behavior and capabilities of each agent
 director_system_prompt = load_prompt_from_file('./prompts/director_system_prompt.txt')
-manager_system_prompt = load_prompt_from_file('./prompts/1manager_system_prompt.txt').replace('{limit_subquestions}', str(limit_subquestions))
+# The manager prompt body is static; the only dynamic part (the sub-question limit)
+# is appended at the end so the cached prompt prefix stays byte-identical
+_MANAGER_STATIC = load_prompt_from_file('./prompts/1manager_system_prompt.txt')
+manager_system_prompt = _MANAGER_STATIC + f"\n\nMax subqueries: {limit_subquestions}\n"
+# Built once; every manager call reuses the same system message dict
+MANAGER_SYSTEM_MESSAGE = {"role": "system", "content": manager_system_prompt}
 worker_system_prompt = load_prompt_from_file('./prompts/worker_system_prompt.txt')
+tool_calling_system_prompt = director_system_prompt + "\n\n" + load_prompt_from_file('./prompts/tool_calling_system_prompt.txt') + f"\n\nMax searches: {limit_subquestions}\n"
 
 # Azure AI Search configuration
 # Used by tools/v_search.py for semantic hybrid search
 azure_search_endpoint = os.getenv("AI_SEARCH_ENDPOINT")
 azure_search_index = os.getenv("AI_SEARCH_INDEX")
 azure_search_api_key = os.getenv("AI_SEARCH_API_KEY")
-#Azure AI search client
-search_client = SearchClient(endpoint = azure_search_endpoint, index_name = azure_search_index, credential = AzureKeyCredential(azure_search_api_key))
+# Searches run in worker threads (asyncio.to_thread), up to one per concurrent
+# sub-question; the default requests pool keeps only 10 connections per host, so
+# the rest would reconnect with a fresh TLS handshake every time
+search_pool_size = 100
+search_http_session = requests.Session()
+search_http_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=search_pool_size))
+#Azure AI search client, closed together with its session on app shutdown
+search_client = SearchClient(
+    endpoint = azure_search_endpoint,
+    index_name = azure_search_index,
+    credential = AzureKeyCredential(azure_search_api_key),
+    transport = RequestsTransport(session=search_http_session, session_owner=True)
+)
+
+def single_company_fast_path(user_prompt: str) -> Optional[str]:
+    """
+    Detect trivial single-company questions that need no decomposition.
+
+    A prompt qualifies when it is short, mentions exactly one known company and
+    contains no comparison/conjunction words that would call for several sub-questions.
+
+    Args:
+        user_prompt (str): The user's original question
+
+    Returns:
+        Optional[str]: Full company name if the fast path applies, otherwise None
+
+    Related Files:
+        - agentic.py: manager() uses this to skip decompose_user_prompt()
+    """
+    if len(user_prompt) >= fast_path_max_prompt_length or _MULTI_PART_RE.search(user_prompt):
+        return None
+
+    companies = {fast_path_company_aliases[alias.lower()] for alias in _COMPANY_ALIAS_RE.findall(user_prompt)}
+    return companies.pop() if len(companies) == 1 else None
+
+def _looks_empty(worker_response: Optional[str]) -> bool:
+    """
+    Return True if a worker response carries no usable information.
+    """
+    worker_response = (worker_response or "").strip()
+    if _DIGIT_RE.search(worker_response):
+        return False
+    if len(worker_response) < _EMPTY_RESPONSE_MAX_LENGTH:
+        return True
+    return len(worker_response) <= _NO_DATA_CHECK_MAX_LENGTH and bool(_NO_DATA_RE.search(worker_response))
+
+def dedupe_context_chunks(context_chunks: List[str]) -> List[str]:
+    """
+    Drop exact duplicate passages (ignoring case and whitespace), keeping the first occurrence.
+
+    Sub-questions about the same company often hit the same search passages, so the
+    merged list carries many exact repeats. Passages are compared after collapsing
+    whitespace and case, which is a set lookup per chunk and needs no extra API call.
+    Overlapping but non-identical chunks (e.g. from neighbouring splits) are all kept.
+
+    Args:
+        context_chunks (List[str]): Chunks from all workers, in sub-question order
+
+    Returns:
+        List[str]: Chunks with duplicates removed, order preserved
+    """
+    seen = set()
+    unique_chunks = []
+    for chunk in context_chunks:
+        key = _WHITESPACE_RE.sub(" ", chunk).strip().lower()
+        if key not in seen:
+            seen.add(key)
+            unique_chunks.append(chunk)
+    return unique_chunks
+
+async def _single_chunk_stream(text: str) -> AsyncIterator[str]:
+    """
+    Wrap a complete response as a one-chunk token stream for manager(stream=True).
+    """
+    yield text
+
+async def decompose_user_prompt(
+    llm_client: AsyncAzureOpenAI,
+    deployment: str,
+    user_prompt: str,
+    user_conversation_history: List[Dict[str, str]]
+) -> Tuple[List[str], List[str]]:
+    """
+    Break the user's question into sub-questions and company names with the manager LLM.
+
+    Args:
+        llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
+        deployment (str): Azure OpenAI deployment name
+        user_prompt (str): The user's original question
+        user_conversation_history (List[Dict[str, str]]): Previous conversation context
+
+    Returns:
+        Tuple[List[str], List[str]]: (list_of_sub_questions, company_names)
+
+    Related Files:
+        - MANAGER_RESPONSE_FORMAT: Structured output schema of the manager's JSON
+        - prompts/1manager_system_prompt.txt: Decomposition instructions
+    """
+    # Generate sub-questions based on user query
+    # This uses the manager_system_prompt loaded from prompts/manager_system_prompt.txt
+    # The static system prompt comes first so Azure can serve it from the prompt cache;
+    # previous turns are sent as native role messages so the shared history prefix
+    # of a conversation is cacheable too
+    completion = await llm_client.chat.completions.create(
+        model=deployment,
+        messages=[
+            MANAGER_SYSTEM_MESSAGE,
+            *user_conversation_history,
+            {"role": "user", "content": user_prompt},
+        ],
+        max_tokens=manager_max_tokens,
+        temperature=0.2,  # decomposition is closer to parsing than creative writing
+        top_p=0.95,
+        frequency_penalty=0,
+        presence_penalty=0,
+        stop=["\n\n\n"],  # cut off runaway output
+        response_format=MANAGER_RESPONSE_FORMAT,
+        extra_body={"prompt_cache_key": MANAGER_PROMPT_CACHE_KEY} if prompt_cache_key_enabled else None
+    )
+
+    manager_json_output = completion.choices[0].message.content
+
+    # Structured outputs guarantee schema-valid JSON, so it is loaded directly. Only a
+    # cut-off (max_tokens) or refused completion can fail; the user's question is then
+    # answered as a single sub-question instead of discarding the request
+    try:
+        manager_response = orjson.loads(manager_json_output or "")
+        list_of_sub_questions = manager_response["list_of_sub_questions"][:limit_subquestions]
+        company_names = manager_response["company_names"]
+    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+        logger.warning("Manager output unusable (finish_reason=%s), answering the question directly: %s", completion.choices[0].finish_reason, e)
+        list_of_sub_questions = [user_prompt]
+        company_names = []
+
+    return list_of_sub_questions, company_names
 
 async def manager(
     llm_client: AsyncAzureOpenAI,
@@ -87,8 +333,9 @@ async def manager(
     user_conversation_history: List[Dict[str, str]],
     connection: AsyncIOMotorCollection,
     chat_history_retrieval_limit: int,
-    conversation_id: str
-) -> Tuple[str, List[str], str]:   
+    conversation_id: str,
+    stream: bool = False
+) -> Tuple[Union[str, AsyncIterator[str]], List[str], Optional[str]]:   
     """
     Manager agent that orchestrates the entire agentic workflow.
     
@@ -103,111 +350,366 @@ async def manager(
         llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
         deployment (str): Azure OpenAI deployment name
         user_prompt (str): The user's original question
-        user_conversation_history (List[Dict[str, str]]): Previous conversation context
+        user_conversation_history (List[Dict[str, str]]): Previous conversation context,
+            trimmed to history_token_budget tokens before use
         connection (AsyncIOMotorCollection): MongoDB connection for data persistence
         chat_history_retrieval_limit (int): Number of previous messages to include
         conversation_id (str): Unique identifier for this conversation
+        stream (bool): Return the director response as a token stream (see
+            agents/director_agent.py director_stream()) instead of a complete string
         
     Returns:
-        Tuple[str, List[str], str]: (director_response, all_context_chunks, conv_pdf_url)
+        Tuple[Union[str, AsyncIterator[str]], List[str], Optional[str]]: (director_response, all_context_chunks, conv_pdf_url)
+            director_response is an async iterator of text deltas when stream is True;
+            conv_pdf_url is None when every worker came back empty and the director was skipped
         
     Workflow:
-        1. Generate sub-questions using manager_system_prompt
-        2. Parse JSON response using tools/json_parseing.py
+        1. Generate sub-questions using manager_system_prompt (skipped for
+           single-company questions, see single_company_fast_path(); replaced by
+           tool_calling_manager() when AGENTIC_TOOL_CALLING is enabled)
+        2. Load the structured-output JSON response
         3. Process sub-questions via agents/sub_question_handler.py
-        4. Collect context chunks from all worker responses
-        5. Synthesize final response via agents/director_agent.py
+        4. Collect context chunks and the agent conversation history from all worker responses
+        5. Persist all sub-question results in one batch via tools/conv_handler.py
+        6. Synthesize final response via agents/director_agent.py, or return
+           _NO_DATA_RESPONSE if every worker response looks empty
         
     Related Files:
         - agents/sub_question_handler.py: Processes individual sub-questions
         - agents/director_agent.py: Synthesizes final response
         - agents/worker_agent.py: Handles individual question processing
-        - tools/json_parseing.py: Parses LLM JSON responses
         - tools/v_search.py: Performs semantic search (via worker agents)
     """
 
     # Generate unique conversation ID for tracking agent interactions
-    agents_conversation_id = str(uuid.uuid4())
-    print(f"- Vector search index = {azure_search_index} AND agents_convertation_id = {agents_conversation_id}")
+    agents_conversation_id = uuid.uuid4().hex
+    logger.debug("Vector search index = %s AND agents_convertation_id = %s", azure_search_index, agents_conversation_id)
     
-    # Generate sub-questions based on user query
-    # This uses the manager_system_prompt loaded from prompts/manager_system_prompt.txt
-    completion = await llm_client.chat.completions.create(
-        model=deployment,
-        messages=[
-            {"role": "system", "content": manager_system_prompt},
-            {"role": "user", "content": f"Previous conversation between user and you: {user_conversation_history},\n user's question: {user_prompt}"},
-        ],
-        max_tokens=800,
-        temperature=0.7,
-        top_p=0.95,
-        frequency_penalty=0,
-        presence_penalty=0,
-        stop=None
-    )
+    # Fast path: a standalone question about a single company is its own sub-question,
+    # so the manager decomposition call can be skipped entirely
+    fast_path_company = None if user_conversation_history else single_company_fast_path(user_prompt)
 
-    manager_json_output = completion.choices[0].message.content
-    
-    # Parse the model response using tools/json_parseing.py
-    required_keys = ["list_of_sub_questions", "company_names"]
-    normalized_manager_response, error = parse_json_from_model_response(manager_json_output, required_keys)
-    
-    #if the json parsing fails, then fallback to the default questions
-    if error:
-        print(f"Using fallback questions due to parsing error: {error}")
-        # Fallback to default questions if parsing fails
-        list_of_sub_questions = [
-            f"What are the carbon emissions of Hindustan Petroleum Corporation Limited?",
-            f"What are the carbon emissions of Indian Oil Corporation Limited?",
-            f"What is the greenhouse gas emission data for Hindustan Petroleum Corporation Limited?"
+    # Long conversations would otherwise send every previous turn to each model call;
+    # the dropped turns are replaced by a background summary when one is configured
+    trimmed_history = trim_history_to_budget(user_conversation_history, history_token_budget)
+    user_conversation_history = with_history_summary(llm_client, conversation_id, user_conversation_history, trimmed_history)
+
+    if tool_calling_enabled and not fast_path_company:
+        return await tool_calling_manager(
+            llm_client, deployment, user_prompt, user_conversation_history, connection,
+            agents_conversation_id, conversation_id, stream
+        )
+
+    if fast_path_company:
+        logger.info("Fast path: single-company question about %s, skipping decomposition", fast_path_company)
+        list_of_sub_questions = [user_prompt]
+        company_names = [fast_path_company]
+    else:
+        list_of_sub_questions, company_names = await decompose_user_prompt(llm_client, deployment, user_prompt, user_conversation_history)
+
+    # One canonical tuple per request: every sub-question shares it, so the search
+    # filter cache and the worker cache scopes see the same key for the same companies
+    company_names = tuple(sorted(set(company_names)))
+
+    if worker_batch_size > 1 and len(list_of_sub_questions) > 1:
+        # Group the sub-questions so each group costs one worker completion
+        batches = [
+            list_of_sub_questions[start:start + worker_batch_size]
+            for start in range(0, len(list_of_sub_questions), worker_batch_size)
         ]
-        company_names = ["Hindustan Petroleum Corporation Limited"]
-    
-    #or else use the questions from the model response
+        logger.info("Processing %d sub-questions in %d batches", len(list_of_sub_questions), len(batches))
+        batch_results = await asyncio.gather(*[
+            run_sub_question_batch(llm_client, deployment, batch, company_names, conversation_id)
+            for batch in batches
+        ])
+        results = [result for batch_result in batch_results for result in batch_result]
     else:
-        list_of_sub_questions = normalized_manager_response["list_of_sub_questions"]
-        company_names = normalized_manager_response["company_names"]
-
-    tasks = [
-        process_sub_question(
-            llm_client, 
-            deployment, 
-            sub_question, 
-            company_names, 
-            search_client, 
-            worker_system_prompt, 
-            top_k,
-            agents_conversation_id,
-            conversation_id,
-            connection
-        ) 
-        for sub_question in list_of_sub_questions
-    ]
-    
-    # Run all tasks concurrently for efficient processing
-    print(f"- Processing {len(tasks)} sub-questions in parallel...")
-    results = await asyncio.gather(*tasks)
-    
-    # Collect all context chunks from worker responses
-    # These chunks contain the relevant information retrieved from the knowledge base
-    all_context_chunks = []
-    for _, context_chunks in results:
-        all_context_chunks.extend(context_chunks)
+        tasks = [
+            run_sub_question(llm_client, deployment, sub_question, company_names, conversation_id)
+            for sub_question in list_of_sub_questions
+        ]
+
+        # Run all tasks concurrently, at most subquestion_concurrency at a time
+        logger.info("Processing %d sub-questions in parallel", len(tasks))
+        results = await asyncio.gather(*tasks)
     
-    print(f"- Collected {len(all_context_chunks)} context chunks from all workers")
+    all_context_chunks, agents_conversation_history = await collect_worker_results(
+        list_of_sub_questions, results, agents_conversation_id, conversation_id, connection
+    )
+
+    # Skip the director when no worker found anything; there is nothing to synthesize
+    # and no report to render, so no PDF URL is returned either
+    if all(_looks_empty(worker_response) for worker_response, _ in results):
+        logger.info("All workers came back empty, skipping director")
+        no_data_response = _single_chunk_stream(_NO_DATA_RESPONSE) if stream else _NO_DATA_RESPONSE
+        return no_data_response, all_context_chunks, None
 
     # Generate final response from director agent using all collected information
     # The director agent (agents/director_agent.py) synthesizes all worker responses
     
-    direcotr_response, conv_pdf_url = await director(
+    run_director = director_stream if stream else director
+    direcotr_response, conv_pdf_url = await run_director(
         llm_client,
         director_system_prompt,
         deployment,
         user_prompt,
-        user_conversation_history,
+        trim_history_to_budget(user_conversation_history, director_history_token_budget),
         connection,
         all_context_chunks,
+        agents_conversation_history,
         agents_conversation_id,
         conversation_id
     )
-    return direcotr_response, all_context_chunks, conv_pdf_url
\ No newline at end of file
+    return direcotr_response, all_context_chunks, conv_pdf_url
+
+async def run_sub_question(
+    llm_client: AsyncAzureOpenAI,
+    deployment: str,
+    sub_question: str,
+    company_names: Tuple[str, ...],
+    conversation_id: str
+) -> Tuple[str, List[str]]:
+    """
+    Process one sub-question under the shared concurrency limit, retrying rate limits.
+
+    Args:
+        llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
+        deployment (str): Azure OpenAI deployment name
+        sub_question (str): Individual sub-question to be processed
+        company_names (Tuple[str, ...]): Sorted, de-duplicated company names for search filtering
+        conversation_id (str): Overall conversation identifier
+
+    Returns:
+        Tuple[str, List[str]]: (worker_response, context_chunks) from process_sub_question()
+
+    Related Files:
+        - agents/sub_question_handler.py: process_sub_question()
+    """
+    return await _retry_rate_limited(lambda: process_sub_question(
+        llm_client,
+        deployment,
+        sub_question,
+        company_names,
+        search_client,
+        worker_system_prompt,
+        top_k,
+        conversation_id
+    ))
+
+async def run_sub_question_batch(
+    llm_client: AsyncAzureOpenAI,
+    deployment: str,
+    sub_questions: List[str],
+    company_names: Tuple[str, ...],
+    conversation_id: str
+) -> List[Tuple[str, List[str]]]:
+    """
+    Batched counterpart of run_sub_question(): one worker completion for several sub-questions.
+
+    Returns:
+        List[Tuple[str, List[str]]]: (worker_response, context_chunks) per sub-question
+
+    Related Files:
+        - agents/sub_question_handler.py: process_sub_question_batch()
+    """
+    return await _retry_rate_limited(lambda: process_sub_question_batch(
+        llm_client,
+        deployment,
+        sub_questions,
+        company_names,
+        search_client,
+        worker_system_prompt,
+        top_k,
+        conversation_id
+    ))
+
+async def _retry_rate_limited(call: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Await call() under subquestion_semaphore, retrying RateLimitError with exponential backoff.
+    """
+    async with subquestion_semaphore:
+        for attempt in range(subquestion_max_attempts):
+            try:
+                return await call()
+            except RateLimitError:
+                if attempt == subquestion_max_attempts - 1:
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.warning("Rate limited on sub-question, retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+
+async def collect_worker_results(
+    list_of_sub_questions: List[str],
+    results: List[Tuple[str, List[str]]],
+    agents_conversation_id: str,
+    conversation_id: str,
+    connection: AsyncIOMotorCollection
+) -> Tuple[List[str], List[Dict[str, str]]]:
+    """
+    Aggregate and persist the worker results of one request.
+
+    Args:
+        list_of_sub_questions (List[str]): Sub-questions in the order they were processed
+        results (List[Tuple[str, List[str]]]): (worker_response, context_chunks) per sub-question
+        agents_conversation_id (str): Unique ID for this agent conversation session
+        conversation_id (str): Overall conversation identifier
+        connection (AsyncIOMotorCollection): MongoDB connection for data persistence
+
+    Returns:
+        Tuple[List[str], List[Dict[str, str]]]: (all_context_chunks, agents_conversation_history)
+
+    Related Files:
+        - tools/conv_handler.py: format_agent_exchange() and inserting_agent_chat_buffer_bulk()
+    """
+    # Collect all context chunks from worker responses and build the agent conversation
+    # history in memory, so the director does not have to read it back from MongoDB
+    # These chunks contain the relevant information retrieved from the knowledge base
+    all_context_chunks = []
+    agents_conversation_history = []
+    for sub_question, (worker_response, context_chunks) in zip(list_of_sub_questions, results):
+        all_context_chunks.extend(context_chunks)
+        agents_conversation_history.extend(format_agent_exchange(sub_question, worker_response))
+    
+    # Workers often retrieve the same passages; drop exact duplicates so each one
+    # appears once in the references payload and the context PDF
+    collected_chunk_count = len(all_context_chunks)
+    all_context_chunks = dedupe_context_chunks(all_context_chunks)
+    logger.info("Collected %d context chunks from all workers (%d after removing exact duplicates)", collected_chunk_count, len(all_context_chunks))
+
+    # Persist every sub-question/answer pair in one round trip using tools/conv_handler.py
+    # The background PDF report reads these documents back by conversation_id
+    await inserting_agent_chat_buffer_bulk(
+        agents_conversation_id,
+        conversation_id,
+        connection,
+        [
+            (sub_question, worker_response, context_chunks)
+            for sub_question, (worker_response, context_chunks) in zip(list_of_sub_questions, results)
+        ]
+    )
+
+    return all_context_chunks, agents_conversation_history
+
+async def tool_calling_manager(
+    llm_client: AsyncAzureOpenAI,
+    deployment: str,
+    user_prompt: str,
+    user_conversation_history: List[Dict[str, str]],
+    connection: AsyncIOMotorCollection,
+    agents_conversation_id: str,
+    conversation_id: str,
+    stream: bool = False
+) -> Tuple[Union[str, AsyncIterator[str]], List[str], Optional[str]]:
+    """
+    Manager and director collapsed into one conversation that fans out via tool calls.
+
+    Instead of a separate decomposition call, the director model is given the
+    search_company_esg tool and decides which focused questions to ask. The tool
+    calls are executed concurrently by the regular worker agents and their answers
+    are fed back to the same conversation for the final synthesis. This saves one
+    LLM round trip per request, and both calls share the same cached prompt prefix.
+
+    Args:
+        llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
+        deployment (str): Azure OpenAI deployment name
+        user_prompt (str): The user's original question
+        user_conversation_history (List[Dict[str, str]]): Previous conversation context
+        connection (AsyncIOMotorCollection): MongoDB connection for data persistence
+        agents_conversation_id (str): Unique ID for this agent conversation session
+        conversation_id (str): Unique identifier for this conversation
+        stream (bool): Return the final answer as a token stream
+
+    Returns:
+        Tuple[Union[str, AsyncIterator[str]], List[str], Optional[str]]: same as manager()
+
+    Related Files:
+        - agents/sub_question_handler.py: Executes each tool call through a worker
+        - agents/director_agent.py: synthesize_response() runs the final completion
+        - prompts/tool_calling_system_prompt.txt: Tool usage instructions
+    """
+    messages = [
+        {"role": "system", "content": tool_calling_system_prompt},
+        *user_conversation_history,
+        {"role": "user", "content": user_prompt},
+    ]
+    shared_params = dict(
+        model=deployment,
+        tools=[SEARCH_COMPANY_ESG_TOOL],
+        extra_body={"prompt_cache_key": TOOL_CALLING_PROMPT_CACHE_KEY} if prompt_cache_key_enabled else None
+    )
+
+    completion = await llm_client.chat.completions.create(
+        messages=messages,
+        tool_choice="auto",
+        max_tokens=manager_max_tokens,
+        temperature=0.2,
+        **shared_params
+    )
+    assistant_message = completion.choices[0].message
+    tool_calls = (assistant_message.tool_calls or [])[:limit_subquestions]
+
+    # The model answered without searching (e.g. a greeting or a follow-up about the previous answer)
+    if not tool_calls:
+        logger.info("Tool calling: answered without searching")
+        direct_response = assistant_message.content or _NO_DATA_RESPONSE
+        return (_single_chunk_stream(direct_response) if stream else direct_response), [], None
+
+    tool_arguments = [_search_tool_arguments(tool_call, user_prompt) for tool_call in tool_calls]
+    list_of_sub_questions = [question for _, question in tool_arguments]
+
+    logger.info("Tool calling: processing %d searches in parallel", len(tool_calls))
+    results = await asyncio.gather(*[
+        run_sub_question(llm_client, deployment, question, (company,) if company else (), conversation_id)
+        for company, question in tool_arguments
+    ])
+
+    all_context_chunks, _ = await collect_worker_results(
+        list_of_sub_questions, results, agents_conversation_id, conversation_id, connection
+    )
+
+    if all(_looks_empty(worker_response) for worker_response, _ in results):
+        logger.info("All workers came back empty, skipping director")
+        no_data_response = _single_chunk_stream(_NO_DATA_RESPONSE) if stream else _NO_DATA_RESPONSE
+        return no_data_response, all_context_chunks, None
+
+    # Feed the worker answers back as tool results; tools stay in the request so the
+    # prompt prefix is identical to the first call, but no further calls are allowed
+    messages.append({
+        "role": "assistant",
+        "content": assistant_message.content,
+        "tool_calls": [
+            {"id": tool_call.id, "type": "function", "function": {"name": tool_call.function.name, "arguments": tool_call.function.arguments}}
+            for tool_call in tool_calls
+        ]
+    })
+    messages.extend(
+        {"role": "tool", "tool_call_id": tool_call.id, "content": worker_response}
+        for tool_call, (worker_response, _) in zip(tool_calls, results)
+    )
+
+    direcotr_response, conv_pdf_url = await synthesize_response(
+        llm_client,
+        dict(messages=messages, tool_choice="none", max_tokens=800, temperature=0.7, top_p=0.95, **shared_params),
+        user_prompt,
+        connection,
+        all_context_chunks,
+        agents_conversation_id,
+        conversation_id,
+        stream=stream
+    )
+    return direcotr_response, all_context_chunks, conv_pdf_url
+
+def _search_tool_arguments(tool_call: Any, user_prompt: str) -> Tuple[str, str]:
+    """
+    Extract (company, question) from a search_company_esg tool call.
+
+    Falls back to the user's prompt when the model sent malformed arguments
+    (invalid JSON, or JSON that is not an object).
+    """
+    try:
+        arguments = orjson.loads(tool_call.function.arguments)
+    except orjson.JSONDecodeError:
+        arguments = {}
+    if not isinstance(arguments, dict):
+        arguments = {}
+    return arguments.get("company", ""), arguments.get("question") or user_prompt
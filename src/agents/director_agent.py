@@ -25,11 +25,23 @@ Related Files:
 """
 
 import os
-from typing import List, Dict, Any, Tuple
+import logging
+import asyncio
+from typing import List, Dict, Any, Tuple, Union, AsyncIterator
 from openai import AsyncAzureOpenAI
 from motor.motor_asyncio import AsyncIOMotorCollection
-from tools.conv_to_pdf_handler import conversation_to_pdf, upload_pdf_to_blob, conversation_with_context_to_pdf
-from tools.conv_handler import get_agents_conv_history, get_agents_total_conv_history
+from datetime import datetime
+from tools.conv_to_pdf_handler import conversation_to_pdf, upload_pdf_to_blob, conversation_with_context_to_pdf, report_blob_url, enqueue_report
+from tools.conv_handler import get_agents_total_qa_pairs
+
+# Prompt caching key for the static director system prompt (see agentic.py)
+prompt_cache_key_enabled = os.getenv("AZURE_OPENAI_PROMPT_CACHE_KEY", "false").lower() == "true"
+DIRECTOR_PROMPT_CACHE_KEY = "esg_director_v1"
+
+logger = logging.getLogger(__name__)
+
+# Local directory for the context report PDF (the summary PDF is uploaded from memory)
+report_output_dir = "conversation_pdfs"
 
 async def director(
     llm_client: AsyncAzureOpenAI,
@@ -39,6 +51,7 @@ async def director(
     user_conversation_history: List[Dict[str, str]],
     connection: AsyncIOMotorCollection,
     all_context_chunks: List[str],                     #list of lists if chunks
+    agents_conversation_history: List[Dict[str, str]],
     agents_conversation_id: str,
     conversation_id: str
 ) -> Tuple[str, str]:
@@ -57,74 +70,235 @@ async def director(
         user_conversation_history (List[Dict[str, str]]): Previous conversation context
         connection (AsyncIOMotorCollection): MongoDB connection for conversation data
         all_context_chunks (List[str]): Information gathered by all worker agents
+        agents_conversation_history (List[Dict[str, str]]): Manager/worker exchanges of this
+            request, built in memory by agentic.py
         agents_conversation_id (str): Unique ID for this agent conversation session
         conversation_id (str): Overall conversation identifier
         
     Returns:
         Tuple[str, str]: (director_response, conv_pdf_url)
             - director_response (str): Final synthesized answer
-            - conv_pdf_url (str): URL to downloadable conversation PDF
+            - conv_pdf_url (str): URL of the conversation PDF (available once the
+              background report job has uploaded it)
             
     Workflow:
-        1. Retrieve agent conversation history via tools/conv_handler.py
+        1. Use the agent conversation history collected by agentic.py
         2. Generate synthesis using director_system_prompt and context chunks
-        3. Create PDF summary via tools/conv_to_pdf_handler.py
-        4. Upload PDF to Azure Blob and return access URL
+        3. Queue PDF summary generation and upload via build_conversation_report()
+        4. Return the synthesized answer with the report's blob URL
         
     Related Files:
         - agentic.py: Calls this function with collected worker responses
-        - tools/conv_handler.py: Provides get_agents_conv_history() and get_agents_total_conv_history()
+        - tools/conv_handler.py: Provides get_agents_total_qa_pairs() for the report
         - tools/conv_to_pdf_handler.py: Handles conversation_to_pdf() and upload_pdf_to_blob()
         - prompts/director_system_prompt.txt: Defines synthesis behavior
         - agents/worker_agent.py: Provides the context chunks being synthesized
     """
-    print("DDDD")
-    
-    # Retrieve conversation history between agents using tools/conv_handler.py
-    # This provides context about what the worker agents discussed and found
-    agents_conversation_history = await get_agents_conv_history(agents_conversation_id, connection)
+    logger.debug("Director synthesizing response")
     
     # Generate final synthesis using the director system prompt
     # The director_system_prompt is loaded from prompts/director_system_prompt.txt in agentic.py
-    completion = await llm_client.chat.completions.create(
+    return await synthesize_response(
+        llm_client,
+        director_completion_params(director_system_prompt, deployment, user_prompt, user_conversation_history, agents_conversation_history),
+        user_prompt,
+        connection,
+        all_context_chunks,
+        agents_conversation_id,
+        conversation_id
+    )
+
+async def director_stream(
+    llm_client: AsyncAzureOpenAI,
+    director_system_prompt: str,
+    deployment: str,
+    user_prompt: str,
+    user_conversation_history: List[Dict[str, str]],
+    connection: AsyncIOMotorCollection,
+    all_context_chunks: List[str],
+    agents_conversation_history: List[Dict[str, str]],
+    agents_conversation_id: str,
+    conversation_id: str
+) -> Tuple[AsyncIterator[str], str]:
+    """
+    Streaming variant of director(): yields the synthesized answer token by token.
+
+    The completion is requested with stream=True so the first tokens can be sent to
+    the browser while the rest of the answer is still being generated (see
+    synthesize_response()).
+
+    Args:
+        Same as director()
+
+    Returns:
+        Tuple[AsyncIterator[str], str]: (token_stream, conv_pdf_url)
+            - token_stream (AsyncIterator[str]): Text deltas of the director response
+            - conv_pdf_url (str): URL of the conversation PDF (available once the
+              background report job has uploaded it)
+
+    Related Files:
+        - agentic.py: Calls this from manager(stream=True)
+        - app.py: Serves the token stream from the /chat/stream endpoint
+    """
+    logger.debug("Director streaming response")
+
+    return await synthesize_response(
+        llm_client,
+        director_completion_params(director_system_prompt, deployment, user_prompt, user_conversation_history, agents_conversation_history),
+        user_prompt,
+        connection,
+        all_context_chunks,
+        agents_conversation_id,
+        conversation_id,
+        stream=True
+    )
+
+async def synthesize_response(
+    llm_client: AsyncAzureOpenAI,
+    completion_params: Dict[str, Any],
+    user_prompt: str,
+    connection: AsyncIOMotorCollection,
+    all_context_chunks: List[str],
+    agents_conversation_id: str,
+    conversation_id: str,
+    stream: bool = False
+) -> Tuple[Union[str, AsyncIterator[str]], str]:
+    """
+    Run the final synthesis completion and queue the conversation report for it.
+
+    Shared by director(), director_stream() and the tool-calling flow in agentic.py,
+    which differ only in how the completion messages are built.
+
+    Args:
+        llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
+        completion_params (Dict[str, Any]): Arguments for chat.completions.create()
+        user_prompt (str): Original user question
+        connection (AsyncIOMotorCollection): MongoDB connection for conversation data
+        all_context_chunks (List[str]): Information gathered by all worker agents
+        agents_conversation_id (str): Unique ID for this agent conversation session
+        conversation_id (str): Overall conversation identifier
+        stream (bool): Return the answer as an async iterator of text deltas
+
+    Returns:
+        Tuple[Union[str, AsyncIterator[str]], str]: (direcotr_response, conv_pdf_url)
+
+    Related Files:
+        - tools/conv_to_pdf_handler.py: Background report queue
+    """
+    # The conversation report PDF is not part of the response payload, so it is
+    # rendered and uploaded by a background job; only its future URL is returned here
+    pdf_filename = report_filename(agents_conversation_id)
+    conv_pdf_url = report_blob_url(pdf_filename)
+
+    def queue_report(direcotr_response: str) -> None:
+        enqueue_report(build_conversation_report(
+            user_prompt,
+            connection,
+            all_context_chunks,
+            direcotr_response,
+            conversation_id,
+            report_output_dir,
+            pdf_filename
+        ), conv_pdf_url)
+
+    if not stream:
+        completion = await llm_client.chat.completions.create(**completion_params)
+        direcotr_response = completion.choices[0].message.content
+        queue_report(direcotr_response)
+        return direcotr_response, conv_pdf_url
+
+    # The first tokens can be sent to the browser while the rest is still being
+    # generated; the report needs the complete answer, so it is queued at the end
+    completion_stream = await llm_client.chat.completions.create(stream=True, **completion_params)
+
+    async def token_stream() -> AsyncIterator[str]:
+        response_parts = []
+        async for chunk in completion_stream:
+            # Azure sends content-filter chunks without choices; skip those
+            if chunk.choices and chunk.choices[0].delta.content:
+                response_parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+
+        queue_report("".join(response_parts))
+
+    return token_stream(), conv_pdf_url
+
+def director_completion_params(
+    director_system_prompt: str,
+    deployment: str,
+    user_prompt: str,
+    user_conversation_history: List[Dict[str, str]],
+    agents_conversation_history: List[Dict[str, str]]
+) -> Dict[str, Any]:
+    """
+    Build the chat completion arguments shared by director() and director_stream().
+
+    Previous turns are passed as native user/assistant messages and the worker
+    exchanges as plain text lines, rather than Python reprs of the lists.
+    """
+    return dict(
         model=deployment,
         messages=[
             {"role": "system", "content": director_system_prompt},
-            {"role": "user", "content": f"Previous conversation between user and you: {user_conversation_history},\nMy question: {user_prompt}"},
-            {"role": "assistant", "content": f"Previous conversation between you and worker agent: {agents_conversation_history}"}
+            *user_conversation_history,
+            {"role": "user", "content": user_prompt},
+            {"role": "assistant", "content": "Previous conversation between you and worker agent:\n" + "\n".join(message["content"] for message in agents_conversation_history)}
         ],
         max_tokens=800,
         temperature=0.7,
         top_p=0.95,
         frequency_penalty=0,
         presence_penalty=0,
-        stop=None
+        stop=None,
+        extra_body={"prompt_cache_key": DIRECTOR_PROMPT_CACHE_KEY} if prompt_cache_key_enabled else None
     )
 
-    direcotr_response = completion.choices[0].message.content
-    
-    # monolog(agents_conversation_history)
-    # Save the conversation to PDF
-    output_dir="conversation_pdfs"
+def report_filename(agents_conversation_id: str) -> str:
+    """
+    Blob name of the conversation report PDF for one agent conversation.
+    """
+    return f"Researched_info_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{agents_conversation_id[:8]}.pdf"
 
-    # Get complete conversation history for PDF generation
-    # This includes all user interactions and agent responses
-    agents_total_conversation_history = await get_agents_total_conv_history(conversation_id, connection)
+async def build_conversation_report(
+    user_prompt: str,
+    connection: AsyncIOMotorCollection,
+    all_context_chunks: List[str],
+    direcotr_response: str,
+    conversation_id: str,
+    output_dir: str,
+    pdf_filename: str
+) -> None:
+    """
+    Render the conversation report PDFs and upload the summary PDF to Azure Blob storage.
 
-    # Generate PDF summary using tools/conv_to_pdf_handler.py
-    # Creates a formatted document with conversation history and final response
-    pdf_path = await conversation_to_pdf(agents_total_conversation_history, direcotr_response, output_dir)
-    
-    #pdf with all the context chunks
-    pdf_path_with_context = await conversation_with_context_to_pdf(user_prompt, agents_total_conversation_history, all_context_chunks, direcotr_response, output_dir)
+    Runs as a background job (see tools/conv_to_pdf_handler.py report_worker()) so that
+    PDF rendering and upload never delay the /chat response.
 
-    # Upload PDF to Azure Blob storage and get public URL
-    # Allows users to download the conversation summary
-    conv_pdf_url = await upload_pdf_to_blob(pdf_path)
-    
-    # Clean up local PDF file after upload
-    os.remove(pdf_path)
+    Args:
+        user_prompt (str): Original user question
+        connection (AsyncIOMotorCollection): MongoDB connection for conversation data
+        all_context_chunks (List[str]): Information gathered by all worker agents
+        direcotr_response (str): Final synthesized answer
+        conversation_id (str): Overall conversation identifier
+        output_dir (str): Local directory for the context PDF
+        pdf_filename (str): Blob name of the summary PDF
 
-    # print(f"Conversation saved to PDF: {pdf_path}")
-    
-    return direcotr_response, conv_pdf_url
+    Related Files:
+        - tools/conv_handler.py: Provides get_agents_total_qa_pairs()
+        - tools/conv_to_pdf_handler.py: Renders and uploads the PDFs
+    """
+    # Get every sub-question/answer pair of the conversation for PDF generation,
+    # already paired by the MongoDB aggregation
+    qa_pairs = await get_agents_total_qa_pairs(conversation_id, connection)
+
+    # Generate PDF summary using tools/conv_to_pdf_handler.py
+    # Creates a formatted document with conversation history and final response,
+    # plus a second pdf with all the context chunks. Both renders are independent,
+    # so they run concurrently instead of one after the other.
+    pdf_bytes, pdf_path_with_context = await asyncio.gather(
+        conversation_to_pdf(qa_pairs, direcotr_response),
+        conversation_with_context_to_pdf(user_prompt, qa_pairs, all_context_chunks, direcotr_response, output_dir)
+    )
+
+    # Upload the in-memory PDF to Azure Blob storage at the URL already returned to the user
+    await upload_pdf_to_blob(pdf_bytes, pdf_filename)
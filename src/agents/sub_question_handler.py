@@ -8,58 +8,50 @@ and persistence throughout the agent interaction workflow.
 Key Responsibilities:
 - Coordinate between manager and worker agents
 - Process individual sub-questions through worker agents
-- Persist agent conversations to database
 - Handle data flow and error management
 
 Dependencies:
 - agents/worker_agent.py: Core sub-question processing
-- tools/conv_handler.py: Database persistence for agent conversations
-- MongoDB: Conversation data storage
 
 Related Files:
-- agentic.py: Calls process_sub_question() for each generated sub-question
+- agentic.py: Calls process_sub_question() for each generated sub-question and
+  persists all results in one batch via tools/conv_handler.py
 - agents/worker_agent.py: Executes the actual sub-question processing
 - agents/director_agent.py: Uses the results for final synthesis
-- tools/conv_handler.py: Provides inserting_agent_chat_buffer() for persistence
 """
 
 from typing import List, Tuple
 from openai import AsyncAzureOpenAI
 from azure.search.documents import SearchClient
-from motor.motor_asyncio import AsyncIOMotorCollection
-from agents.worker_agent import worker
-from tools.conv_handler import inserting_agent_chat_buffer
+from agents.worker_agent import worker, worker_batch
 
 async def process_sub_question(
     llm_client: AsyncAzureOpenAI, 
     deployment: str, 
     sub_question: str, 
-    company_names: List[str], 
+    company_names: Tuple[str, ...], 
     search_client: SearchClient, 
     worker_system_prompt: str, 
     top_k: int,
-    agents_conversation_id: str,
-    conversation_id: str,
-    connection: AsyncIOMotorCollection
+    conversation_id: str
 ) -> Tuple[str, List[str]]:
     """
-    Processes a single sub-question using worker agents and stores results in the database.
+    Processes a single sub-question using worker agents.
     
     This function acts as middleware in the agentic workflow, coordinating between
     the manager agent (which generates sub-questions) and worker agents (which process them).
-    It also handles data persistence to ensure conversation continuity and traceability.
+    Persistence is left to the manager, which writes all sub-question results in a
+    single batch once every worker has finished.
     
     Args:
         llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
         deployment (str): Azure OpenAI deployment name
         sub_question (str): Individual sub-question to be processed
-        company_names (List[str]): List of companies for search filtering
+        company_names (Tuple[str, ...]): Sorted, de-duplicated company names for search filtering
         search_client (SearchClient): Azure AI Search client for semantic search
         worker_system_prompt (str): System prompt for worker agent behavior
         top_k (int): Number of context chunks to retrieve
-        agents_conversation_id (str): Unique ID for this agent conversation session
         conversation_id (str): Overall conversation identifier
-        connection (AsyncIOMotorCollection): MongoDB connection for data persistence
         
     Returns:
         Tuple[str, List[str]]: (worker_response, context_chunks)
@@ -69,13 +61,11 @@ async def process_sub_question(
     Workflow:
         1. Invoke worker agent via agents/worker_agent.py
         2. Process sub-question with semantic search and LLM response
-        3. Persist conversation data via tools/conv_handler.py
-        4. Return worker response and context for aggregation
+        3. Return worker response and context for aggregation and persistence
         
     Related Files:
         - agentic.py: Creates tasks for each sub-question using this function
         - agents/worker_agent.py: Provides worker() function for sub-question processing
-        - tools/conv_handler.py: Provides inserting_agent_chat_buffer() for persistence
         - agents/director_agent.py: Uses aggregated results for final synthesis
         - tools/v_search.py: Used by worker for semantic search (indirect dependency)
     """
@@ -94,21 +84,44 @@ async def process_sub_question(
         conversation_id
     )
     
-    # Persist the agent conversation to database using tools/conv_handler.py
-    # This ensures conversation traceability and enables director agent context retrieval
-    await inserting_agent_chat_buffer(
-        agents_conversation_id, 
-        conversation_id,
-        connection,
-        sub_question, 
-        worker_response, 
-        context_chunks
-    )
-
-    # print(conversation_id)
-    # print(agents_conversation_id)
-    # print("================================") 
-    
     # Return worker response and context chunks for aggregation
     # These will be collected by the manager agent and passed to the director
-    return worker_response, context_chunks
\ No newline at end of file
+    return worker_response, context_chunks
+
+async def process_sub_question_batch(
+    llm_client: AsyncAzureOpenAI,
+    deployment: str,
+    sub_questions: List[str],
+    company_names: Tuple[str, ...],
+    search_client: SearchClient,
+    worker_system_prompt: str,
+    top_k: int,
+    conversation_id: str
+) -> List[Tuple[str, List[str]]]:
+    """
+    Processes several sub-questions with a single worker completion.
+
+    Batched counterpart of process_sub_question(), used by agentic.py when
+    WORKER_BATCH_SIZE is greater than 1.
+
+    Args:
+        sub_questions (List[str]): Sub-questions to be processed together
+        Otherwise the same as process_sub_question()
+
+    Returns:
+        List[Tuple[str, List[str]]]: (worker_response, context_chunks) per sub-question,
+            in the order of sub_questions
+
+    Related Files:
+        - agents/worker_agent.py: Provides worker_batch()
+    """
+    return await worker_batch(
+        llm_client,
+        deployment,
+        sub_questions,
+        company_names,
+        search_client,
+        worker_system_prompt,
+        top_k,
+        conversation_id
+    )
@@ -21,18 +21,89 @@ Related Files:
 - agentic.py: Coordinates worker responses via sub_question_handler
 - agents/director_agent.py: Synthesizes worker responses into final answer
 - tools/v_search.py: Provides semantic_hybrid_search() functionality
+- tools/semantic_cache.py: SemanticCache backing the sub-question answer cache
 """
 
+import os
+import re
+import asyncio
+import logging
 from typing import List, Tuple
 from openai import AsyncAzureOpenAI
 from azure.search.documents import SearchClient
 from tools.v_search import semantic_hybrid_search
+from tools.json_parseing import parse_json_from_model_response
+from tools.semantic_cache import SemanticCache, embed_text
+from tools.tokens import truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Semantic cache of sub-question answers: the manager often produces near-identical
+# sub-questions for similar prompts, and a hit skips both the search and the completion.
+# Entries are scoped by company filter and the numbers in the sub-question (see
+# sub_question_scope()) and expire after a few minutes. Off by default: every
+# sub-question then costs an extra embedding call, hit or miss.
+worker_cache_enabled = os.getenv("WORKER_SEMANTIC_CACHE", "false").lower() == "true"
+worker_cache_threshold = float(os.getenv("WORKER_CACHE_THRESHOLD", "0.92"))
+# Token budget for the retrieved chunks of one sub-question; search results are ordered
+# by relevance, so the least relevant tail is cut first
+context_token_budget = int(os.getenv("WORKER_CONTEXT_TOKEN_BUDGET", "4000"))
+CHUNK_SEPARATOR = "\n---\n"
+
+# LSH keeps lookups to a few candidates once thousands of sub-questions are cached, and
+# PCA (fitted on the first 2000 sub-questions) keeps 256 of the 1536 embedding dimensions;
+# each tier fits its own projection, which is only kept across restarts when a file is configured
+worker_cache_pca_components = int(os.getenv("WORKER_CACHE_PCA_COMPONENTS", "256"))
+worker_cache_pca_path = os.getenv("WORKER_CACHE_PCA_PATH")
+search_cache_pca_path = os.getenv("SEARCH_CACHE_PCA_PATH")
+worker_cache = SemanticCache(
+    threshold=worker_cache_threshold, max_entries=10_000, ttl_seconds=300, lsh_tables=8, lsh_bits=10,
+    pca_components=worker_cache_pca_components, pca_path=worker_cache_pca_path
+)
+# Second tier for the search results alone: rephrased sub-questions that miss the answer
+# cache usually retrieve the same chunks, so a looser threshold still skips the search.
+# Uses the same company and number scope as worker_cache; opt-in like it
+search_cache_enabled = os.getenv("SEARCH_SEMANTIC_CACHE", "false").lower() == "true"
+search_cache_threshold = float(os.getenv("SEARCH_CACHE_THRESHOLD", "0.90"))
+search_cache = SemanticCache(
+    threshold=search_cache_threshold, max_entries=10_000, ttl_seconds=300, lsh_tables=8, lsh_bits=10,
+    pca_components=worker_cache_pca_components, pca_path=search_cache_pca_path
+)
+
+# Appended after the per-question context in worker_batch(); the worker system prompt
+# itself stays unchanged so it keeps its cached prefix
+BATCH_ANSWER_INSTRUCTIONS = (
+    "Answer every question above separately, using only the relevant information given for it. "
+    'Respond with a JSON object of the form {"answers": [{"id": <question number>, "answer": "<your answer>"}]} '
+    "containing one entry per question."
+)
+
+# Years, fiscal years, scope numbers and other figures in a sub-question
+_NUMBER_RE = re.compile(r"\d+")
+
+def sub_question_scope(sub_question: str, company_names: Tuple[str, ...]) -> str:
+    """
+    Cache scope of a sub-question: its companies plus every number it mentions.
+
+    "FY22 Scope 1 emissions" and "FY23 Scope 2 emissions" embed far above the cache
+    threshold but need different answers, so sub-questions only match entries that
+    mention the same years, scopes and figures.
+
+    Args:
+        sub_question (str): Specific question to be processed
+        company_names (Tuple[str, ...]): Sorted, de-duplicated company names (see agentic.py)
+
+    Returns:
+        str: Scope key for worker_cache and search_cache
+    """
+    numbers = sorted(set(_NUMBER_RE.findall(sub_question)))
+    return ",".join(company_names) + "|" + ",".join(numbers)
 
 async def worker(
     llm_client: AsyncAzureOpenAI,
     deployment: str,
     sub_question: str,
-    company_names: List[str],
+    company_names: Tuple[str, ...],
     agents_conversation_history: str,
     search_client: SearchClient,
     system_prompt: str,
@@ -50,7 +121,7 @@ async def worker(
         llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
         deployment (str): Azure OpenAI deployment name
         sub_question (str): Specific question to be processed
-        company_names (List[str]): List of company names for filtering search results
+        company_names (Tuple[str, ...]): Sorted, de-duplicated company names for filtering search results
         agents_conversation_history (str): Previous agent interactions (currently unused)
         search_client (SearchClient): Azure AI Search client for semantic search
         system_prompt (str): Worker agent behavior instructions
@@ -63,10 +134,11 @@ async def worker(
             - context_chunks (List[str]): Source information used for the response
             
     Workflow:
-        1. Perform semantic hybrid search via tools/v_search.py
-        2. Filter results using company names for relevance
-        3. Generate contextual response using retrieved information
-        4. Return both response and source context for transparency
+        1. Return the cached answer of a semantically equivalent sub-question, if any
+        2. Perform semantic hybrid search via tools/v_search.py (or reuse cached chunks)
+        3. Filter results using company names for relevance
+        4. Generate contextual response using retrieved information
+        5. Cache and return both response and source context for transparency
         
     Related Files:
         - tools/v_search.py: Provides semantic_hybrid_search() for information retrieval
@@ -77,19 +149,69 @@ async def worker(
     """
     # return "worker responded", ["","",""]
 
+    # A semantically equivalent sub-question about the same companies and figures
+    # answered moments ago is served from the cache, skipping search and completion
+    cache_scope = sub_question_scope(sub_question, company_names)
+    sub_question_embedding = None
+    if worker_cache_enabled or search_cache_enabled:
+        try:
+            sub_question_embedding = await embed_text(llm_client, sub_question)
+        except Exception as e:
+            logger.warning("Skipping worker caches, embedding failed: %s", e)
+
+    if worker_cache_enabled and sub_question_embedding is not None:
+        cached = worker_cache.lookup(sub_question_embedding, cache_scope)
+        if cached is not None:
+            logger.debug("Worker cache hit: %s", sub_question)
+            return cached
+
     # Perform semantic hybrid search using tools/v_search.py
-    # This combines vector similarity and text search with company name filtering
-    context_chunks, titles = await semantic_hybrid_search(sub_question, search_client, top_k, company_names)
+    # This combines vector similarity and text search with company name filtering;
+    # a near-duplicate sub-question about the same companies and figures reuses its chunks
+    use_search_cache = search_cache_enabled and sub_question_embedding is not None
+    context_chunks = search_cache.lookup(sub_question_embedding, cache_scope) if use_search_cache else None
+    if context_chunks is None:
+        context_chunks, titles = await semantic_hybrid_search(sub_question, search_client, top_k, company_names)
+        if use_search_cache:
+            search_cache.store(sub_question_embedding, context_chunks, cache_scope)
+
+    response_message = await answer_sub_question(llm_client, deployment, sub_question, context_chunks, system_prompt)
+
+    if worker_cache_enabled and sub_question_embedding is not None:
+        worker_cache.store(sub_question_embedding, (response_message, context_chunks), cache_scope)
     
-    user_message_with_context = f"#My question: {sub_question}\n\n#Relevant information: {context_chunks}"
+    # Return both the generated response and the source context
+    # Context chunks are used by director agent for synthesis and transparency
+    return response_message, context_chunks
+
+async def answer_sub_question(
+    llm_client: AsyncAzureOpenAI,
+    deployment: str,
+    sub_question: str,
+    context_chunks: List[str],
+    system_prompt: str
+) -> str:
+    """
+    Answer one sub-question from context that has already been retrieved.
 
+    Args:
+        llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
+        deployment (str): Azure OpenAI deployment name
+        sub_question (str): Specific question to be answered
+        context_chunks (List[str]): Search results for the sub-question
+        system_prompt (str): Worker agent behavior instructions
+
+    Returns:
+        str: Worker's answer to the sub-question
+    """
     # Generate response using worker system prompt and retrieved context
     # The system_prompt is loaded from prompts/worker_system_prompt.txt in agentic.py
     completion = await llm_client.chat.completions.create(
         model=deployment,
         messages=[
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message_with_context}
+            {"role": "user", "content": f"#Relevant information:\n{format_context(context_chunks)}"},
+            {"role": "user", "content": f"#My question: {sub_question}"}
         ],
         max_tokens=800,
         temperature=0.7,
@@ -99,8 +221,113 @@ async def worker(
         stop=None
     )
 
-    response_message = completion.choices[0].message.content
-    
-    # Return both the generated response and the source context
-    # Context chunks are used by director agent for synthesis and transparency
-    return response_message, context_chunks
\ No newline at end of file
+    return completion.choices[0].message.content
+
+def format_context(context_chunks: List[str]) -> str:
+    """
+    Join retrieved chunks into prompt text, truncated to context_token_budget tokens.
+
+    The chunks are joined with a plain separator rather than interpolating the list,
+    whose repr adds quotes, commas and escaped newlines that cost tokens.
+
+    Args:
+        context_chunks (List[str]): Search results for one sub-question
+
+    Returns:
+        str: Prompt text with the chunks
+    """
+    return truncate_to_tokens(CHUNK_SEPARATOR.join(context_chunks), context_token_budget)
+
+async def worker_batch(
+    llm_client: AsyncAzureOpenAI,
+    deployment: str,
+    sub_questions: List[str],
+    company_names: Tuple[str, ...],
+    search_client: SearchClient,
+    system_prompt: str,
+    top_k: int,
+    conversation_id: str
+) -> List[Tuple[str, List[str]]]:
+    """
+    Processes several sub-questions with one search each but a single LLM completion.
+
+    The searches run concurrently; their results are then enumerated in one prompt and
+    the model returns a JSON list of answers indexed by question number, so N
+    sub-questions cost one round-trip to Azure OpenAI instead of N.
+
+    Args:
+        llm_client (AsyncAzureOpenAI): Azure OpenAI client for LLM interactions
+        deployment (str): Azure OpenAI deployment name
+        sub_questions (List[str]): Questions to be processed together
+        company_names (Tuple[str, ...]): Sorted, de-duplicated company names for filtering search results
+        search_client (SearchClient): Azure AI Search client for semantic search
+        system_prompt (str): Worker agent behavior instructions
+        top_k (int): Number of context chunks to retrieve per sub-question
+        conversation_id (str): Conversation identifier for tracking
+
+    Returns:
+        List[Tuple[str, List[str]]]: (response_message, context_chunks) per sub-question,
+            in the order of sub_questions
+
+    Workflow:
+        1. Run semantic_hybrid_search() for every sub-question concurrently
+        2. Ask for all answers in one JSON-mode completion
+        3. Answer any question missing from the parsed output with answer_sub_question()
+
+    Related Files:
+        - agents/sub_question_handler.py: Calls this via process_sub_question_batch()
+        - tools/json_parseing.py: Parses the batched answers
+    """
+    searches = await asyncio.gather(*[
+        semantic_hybrid_search(sub_question, search_client, top_k, company_names)
+        for sub_question in sub_questions
+    ])
+    context_per_question = [context_chunks for context_chunks, _ in searches]
+
+    user_message_with_context = "\n\n".join(
+        f"#Question {number}: {sub_question}\n#Relevant information:\n{format_context(context_chunks)}"
+        for number, (sub_question, context_chunks) in enumerate(zip(sub_questions, context_per_question), start=1)
+    ) + "\n\n" + BATCH_ANSWER_INSTRUCTIONS
+
+    completion = await llm_client.chat.completions.create(
+        model=deployment,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message_with_context}
+        ],
+        max_tokens=800 * len(sub_questions),
+        temperature=0.7,
+        top_p=0.95,
+        frequency_penalty=0,
+        presence_penalty=0,
+        stop=None,
+        response_format={"type": "json_object"}
+    )
+
+    parsed, error = parse_json_from_model_response(completion.choices[0].message.content, ["answers"])
+    answers = {}
+    if not error and not isinstance(parsed.get("answers"), list):
+        error = f"'answers' is {type(parsed.get('answers')).__name__}, expected a list"
+    if error:
+        logger.warning("Batched worker output could not be parsed, answering one by one: %s", error)
+    else:
+        for item in parsed["answers"]:
+            if isinstance(item, dict) and isinstance(item.get("answer"), str):
+                try:
+                    answers[int(item.get("id"))] = item["answer"]
+                except (TypeError, ValueError):
+                    continue
+
+    # Questions the model skipped are answered individually from the context already retrieved
+    missing = [number for number in range(1, len(sub_questions) + 1) if number not in answers]
+    if missing:
+        fallback_answers = await asyncio.gather(*[
+            answer_sub_question(llm_client, deployment, sub_questions[number - 1], context_per_question[number - 1], system_prompt)
+            for number in missing
+        ])
+        answers.update(zip(missing, fallback_answers))
+
+    return [
+        (answers[number], context_chunks)
+        for number, context_chunks in enumerate(context_per_question, start=1)
+    ]
\ No newline at end of file
@@ -15,6 +15,7 @@ Dependencies:
 - agentic.py: Core agent orchestration logic
 - tools/conv_handler.py: Conversation history management
 - tools/conv_to_pdf_handler.py: PDF generation (via agentic flow)
+- tools/semantic_cache.py: Semantic response cache in front of the agentic flow
 - Azure OpenAI: LLM services
 - MongoDB: Conversation persistence
 
@@ -24,57 +25,44 @@ Related Files:
 - tools/conv_handler.py: Database operations for conversations
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import os
+import logging
 from dotenv import load_dotenv
 import uuid
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional, Dict, Any, List, Tuple
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, Tuple, Union, AsyncIterator, Set
 from openai import AsyncAzureOpenAI  
+import httpx
+import importlib.util
 import uvicorn
-from tools.conv_handler import conv_history, inserting_chat_buffer
-from agentic import manager
-from tools.conv_to_pdf_handler import conversation_to_pdf
+from tools.conv_handler import conv_history, conv_histories, inserting_chat_buffer, ensure_chat_history_indexes, chat_buffer_flusher, flush_chat_buffer
+from tools.tokens import get_encoding
+from tools.semantic_cache import SemanticCache, ExactPromptCache, embed_text, context_scope, prompt_scope, load_semantic_cache, persist_semantic_cache_entry, ensure_semantic_cache_indexes
+from agentic import manager, search_client
+from tools.conv_to_pdf_handler import start_report_workers, stop_report_workers, wait_for_report, get_pdf_process_pool, shutdown_pdf_process_pool
 import datetime
+import asyncio
+import orjson
 
 # Load environment variables from .env file
 load_dotenv()
-app = FastAPI()
+
+# Root log level (DEBUG logs the full prompts); debug messages are formatted lazily,
+# so at the default INFO level their arguments are never turned into strings
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger(__name__)
 
 # Configuration for conversation context
 chat_history_retrieval_limit = 10 # number of previous conversation to be used by director agent to respond.
-
-# CORS configuration for frontend integration
-# Add CORS middleware
-origins = [
-    "http://localhost", # Allow localhost
-    "http://localhost:5173", # Allow Vite default port
-    "http://localhost:3000", # Allow common React dev port
-    "http://localhost:8080", # Allow common React dev port
-    "https://www.esgai.space/", # Add your Vercel URL here
-    "https://www.esgai.space",
-    "https://deploy-dana-frontend-woj6-git-main-adityasarsenals-projects.vercel.app/",
-    "https://esgai-frontend-fngrdkfke5h0aphb.eastus2-01.azurewebsites.net",
-    "https://esgai-frontend-fngrdkfke5h0aphb.eastus2-01.azurewebsites.net/",
-    "https://esgai-frontend-fngrdkfke5h0aphb.eastus2-01.azurewebsites.net/",
-    "http://localhost:8080/chat",
-    "*",
-    "/",
-    "/*",
-    "*/"
-    # Add the deployed frontend URL here if applicable
-    # "https://your-frontend-domain.com",
-]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins, # List of allowed origins
-    allow_credentials=True,
-    allow_methods=["*"], # Allow all methods (GET, POST, etc.)
-    allow_headers=["*"], # Allow all headers
-)
+semantic_cache_enabled = os.getenv("SEMANTIC_CACHE", "false").lower() == "true" # answer similar (not only identical) prompts from the semantic tier.
+semantic_cache_threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")) # minimum cosine similarity between prompts to reuse a cached response.
+exact_cache_ttl_seconds = float(os.getenv("EXACT_CACHE_TTL_SECONDS", "600")) # how long an identical prompt is answered from the exact-match tier.
+semantic_cache_ttl_seconds = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400")) # how long a similar prompt is answered from the semantic tier (and kept in MongoDB).
 
  # Request model for feedback endpoint
 class FeedbackRequest(BaseModel):
@@ -101,25 +89,164 @@ class ChatRequest(BaseModel):
 
 # MongoDB connection configuration
 # Used by tools/conv_handler.py for conversation persistence
+# Motor keeps every database call non-blocking; the pool keeps warm connections
+# around so concurrent /chat requests neither queue nor reconnect to Cosmos.
+# The clients are created in lifespan() rather than at import time, so importing
+# the app stays cheap and DNS/TLS setup happens before the first request is served
 connection_string = os.getenv("MONGO_CONNECTION_STRING")
-mongo_client = AsyncIOMotorClient(connection_string)
-db = mongo_client["ChatHistoryDatabase"]
-connection = db["chat-history-with-cosmos"]
-connection_for_feedback = db["DbForFeedback"]
+mongo_client: Optional[AsyncIOMotorClient] = None
+connection: Optional[AsyncIOMotorCollection] = None
+connection_for_feedback: Optional[AsyncIOMotorCollection] = None
+connection_for_cache: Optional[AsyncIOMotorCollection] = None
 
 # Azure OpenAI configuration
 # Used by agentic.py and all agent modules
 endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
 deployment = os.getenv("AZURE_OPENAI_DEPLOYED_NAME")
 api_key = os.getenv("AZURE_OPENAI_KEY")
+llm_client: Optional[AsyncAzureOpenAI] = None
+
+def create_mongo_client() -> AsyncIOMotorClient:
+    """
+    Build the pooled MongoDB (Cosmos DB) client used for chat history, feedback and the response cache.
+    """
+    return AsyncIOMotorClient(
+        connection_string,
+        maxPoolSize=100,
+        minPoolSize=10,
+        maxConnecting=5,           # open new connections faster during bursts
+        maxIdleTimeMS=60000,       # recycle before Cosmos drops idle connections (120s)
+        waitQueueTimeoutMS=5000,
+        socketTimeoutMS=10000,
+        connectTimeoutMS=5000,
+        retryWrites=False          # Cosmos DB for MongoDB does not support retryable writes
+    )
+
+def create_llm_client() -> AsyncAzureOpenAI:
+    """
+    Build the Azure OpenAI client on one long-lived HTTP connection pool.
+
+    Requests reuse keep-alive connections instead of paying a TCP/TLS handshake each
+    time. HTTP/2 multiplexes concurrent worker calls over fewer connections; httpx
+    needs the h2 package for it, so it is only enabled when h2 is installed.
+    """
+    llm_http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        timeout=httpx.Timeout(60.0, connect=5.0),  # long director/worker completions can exceed 30s
+        http2=importlib.util.find_spec("h2") is not None
+    )
+    return AsyncAzureOpenAI(
+        api_key=api_key,
+        azure_endpoint=endpoint,
+        api_version="2024-10-01-preview",  # 2024-10-01-preview+ enables automatic prompt (prefix) caching
+        http_client=llm_http_client
+    )
+
+# Semantic response cache used by agentic_flow() to skip the agent pipeline
+# for prompts that were already answered (see tools/semantic_cache.py)
+response_cache = SemanticCache(threshold=semantic_cache_threshold, ttl_seconds=semantic_cache_ttl_seconds)
+# Exact-match tier in front of it, so repeated prompts skip even the embedding call
+exact_response_cache = ExactPromptCache(ttl_seconds=exact_cache_ttl_seconds)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Create the shared clients and background tasks on startup and release them on shutdown.
+
+    Workflow:
+        1. Create the MongoDB and Azure OpenAI clients and ping MongoDB, so the first
+           requests don't pay the connection handshake
+        2. Make sure the chat history indexes used by conv_history() exist and load
+           the tokenizer used for token budgets
+        3. Create the semantic cache indexes (sort and TTL) and load the most recent
+           persisted entries from MongoDB into memory
+        4. Start the PDF rendering process pool, the report PDF workers and the chat
+           history flusher
+        5. On shutdown, let queued reports finish (REPORT_DRAIN_TIMEOUT_SECONDS), stop the
+           report workers and their PDF rendering processes, write
+           whatever chat history is still queued, then close the Azure OpenAI, Azure AI
+           Search and MongoDB connection pools so restarts do not leak sockets
+
+    Related Files:
+        - tools/conv_handler.py: Index creation and the chat history flusher
+        - tools/conv_to_pdf_handler.py: Background report workers
+        - tools/semantic_cache.py: Persisted semantic cache entries
+    """
+    global mongo_client, connection, connection_for_feedback, connection_for_cache, llm_client
 
-llm_client = AsyncAzureOpenAI(
-    api_key=api_key,
-    azure_endpoint=endpoint,
-    api_version="2024-05-01-preview"
+    mongo_client = create_mongo_client()
+    db = mongo_client["ChatHistoryDatabase"]
+    connection = db["chat-history-with-cosmos"]
+    connection_for_feedback = db["DbForFeedback"]
+    connection_for_cache = db["SemanticResponseCache"]
+    llm_client = create_llm_client()
+
+    try:
+        await mongo_client.admin.command("ping")
+    except Exception as e:
+        logger.warning("MongoDB ping failed on startup: %s", e)
+
+    await ensure_chat_history_indexes(connection)
+
+    # Load the tokenizer now, in a thread: the first load may download its BPE file,
+    # which would otherwise block the event loop inside the first request
+    await asyncio.to_thread(get_encoding)
+
+    await ensure_semantic_cache_indexes(connection_for_cache, semantic_cache_ttl_seconds)
+    if semantic_cache_enabled:
+        await load_semantic_cache(response_cache, connection_for_cache)
+        logger.info("Loaded %d semantic cache entries", len(response_cache))
+
+    get_pdf_process_pool()
+    report_worker_tasks = start_report_workers()
+    chat_flusher_task = asyncio.create_task(chat_buffer_flusher())
+
+    yield
+
+    await stop_report_workers(report_worker_tasks)
+    shutdown_pdf_process_pool()
+
+    # Let the flusher write the batch it is holding before the rest of the queue is drained
+    chat_flusher_task.cancel()
+    await asyncio.gather(chat_flusher_task, return_exceptions=True)
+    await flush_chat_buffer()
+
+    await llm_client.close()
+    search_client.close()
+    mongo_client.close()
+
+app = FastAPI(lifespan=lifespan)
+
+# CORS configuration for frontend integration
+# Browsers send the Origin without a trailing slash, so entries are exact origins.
+# Starlette looks these up in the frozenset and falls back to one precompiled
+# regex for the production domain and Vercel preview deployments
+origins = frozenset({
+    "http://localhost", # Allow localhost
+    "http://localhost:5173", # Allow Vite default port
+    "http://localhost:3000", # Allow common React dev port
+    "http://localhost:8080", # Allow common React dev port
+    "https://esgai-frontend-fngrdkfke5h0aphb.eastus2-01.azurewebsites.net",
+    # Add the deployed frontend URL here if applicable
+    # "https://your-frontend-domain.com",
+})
+origin_regex = r"^https://(www\.)?esgai\.space$|^https://.*\.vercel\.app$"
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=origins, # Exact allowed origins
+    allow_origin_regex=origin_regex, # esgai.space and Vercel deployments
+    allow_credentials=True,
+    allow_methods=["*"], # Allow all methods (GET, POST, etc.)
+    allow_headers=["*"], # Allow all headers
 )
 
-async def agentic_flow(user_prompt: str, conversation_id: str) -> Tuple[str, List[str], str]:
+async def agentic_flow(
+    user_prompt: str,
+    conversation_id: str,
+    stream: bool = False,
+    provided_conversation_history: Optional[List[Dict[str, str]]] = None
+) -> Tuple[Union[str, AsyncIterator[str]], List[str], str]:
     """
     Orchestrates the complete agentic workflow for processing user queries.
     
@@ -129,37 +256,154 @@ async def agentic_flow(user_prompt: str, conversation_id: str) -> Tuple[str, Lis
     Args:
         user_prompt (str): The user's question to be processed
         conversation_id (str): Unique identifier for conversation context
+        stream (bool): Return final_response as an async iterator of text deltas
+        provided_conversation_history (Optional[List[Dict[str, str]]]): History already
+            loaded by the caller (e.g. /chat/batch); fetched from MongoDB when None
         
     Returns:
-        Tuple[str, List[str], str]: (final_response, all_context_chunks, agents_conv_pdf_url)
+        Tuple[Union[str, AsyncIterator[str]], List[str], str]: (final_response, all_context_chunks, agents_conv_pdf_url)
         
     Workflow:
         1. Retrieve conversation history via tools/conv_handler.py
-        2. Invoke manager agent from agentic.py
-        3. Return comprehensive response with context and PDF URL
+        2. Return a cached response for identical (exact tier) or semantically
+           equivalent prompts asked in the same conversational context
+        3. Invoke manager agent from agentic.py on a cache miss
+        4. Return comprehensive response with context and PDF URL
         
     Related Files:
         - agentic.py: Contains the manager() function that orchestrates agents
         - tools/conv_handler.py: Provides conv_history() for context retrieval
+        - tools/semantic_cache.py: Semantic response cache checked before the manager
         - agents/director_agent.py: Generates final response (called via agentic.py)
         - tools/conv_to_pdf_handler.py: Creates PDF summary (via director agent)
     """
     
     # Retrieve conversation history using tools/conv_handler.py
-    provided_conversation_history = await conv_history(conversation_id, connection, chat_history_retrieval_limit)
+    if provided_conversation_history is None:
+        provided_conversation_history = await conv_history(conversation_id, connection, chat_history_retrieval_limit)
+
+    logger.debug("USER : %s", user_prompt)
 
-    print(f"🟢  USER : {user_prompt}")
+    # A follow-up question means something different depending on the conversation
+    # that came before it, so cache entries are scoped by a hash of that context
+    cache_scope = context_scope(provided_conversation_history)
+
+    cached = exact_response_cache.lookup(user_prompt, cache_scope)
+    if cached is not None:
+        logger.info("Exact prompt cache hit")
+        cached_response = single_chunk_stream(cached["response"]) if stream else cached["response"]
+        return cached_response, cached["references"], cached["agents_conv_pdf_url"]
+
+    # The semantic tier is opt-in; its entries are also scoped by the companies and
+    # figures in the prompt (see prompt_scope()), so a similar question about another
+    # company or year never gets this answer
+    prompt_embedding = None
+    if semantic_cache_enabled:
+        try:
+            prompt_embedding = await embed_text(llm_client, user_prompt)
+        except Exception as e:
+            logger.warning("Skipping semantic cache, embedding failed: %s", e)
+
+    if prompt_embedding is not None:
+        cached = response_cache.lookup(prompt_embedding, prompt_scope(user_prompt, cache_scope))
+        if cached is not None:
+            logger.info("Semantic cache hit")
+            cached_response = single_chunk_stream(cached["response"]) if stream else cached["response"]
+            return cached_response, cached["references"], cached["agents_conv_pdf_url"]
     
     # Execute the main agentic workflow from agentic.py
     # This coordinates: Manager -> Workers -> Director agents
-    final_response, all_context_chunks, agents_conv_pdf_url = await manager(llm_client, deployment, user_prompt, provided_conversation_history, connection, chat_history_retrieval_limit, conversation_id)
+    final_response, all_context_chunks, agents_conv_pdf_url = await manager(llm_client, deployment, user_prompt, provided_conversation_history, connection, chat_history_retrieval_limit, conversation_id, stream)
+
+    if stream:
+        # The complete answer only exists once the stream has been consumed,
+        # so the cache write happens at the end of the stream
+        async def cached_stream() -> AsyncIterator[str]:
+            response_parts = []
+            async for token in final_response:
+                response_parts.append(token)
+                yield token
+            schedule_remember_response(user_prompt, prompt_embedding, cache_scope, "".join(response_parts), all_context_chunks, agents_conv_pdf_url)
 
-    # print(f"🔴  MODEL : {final_response}")
+        return cached_stream(), all_context_chunks, agents_conv_pdf_url
+
+    schedule_remember_response(user_prompt, prompt_embedding, cache_scope, final_response, all_context_chunks, agents_conv_pdf_url)
 
     return final_response, all_context_chunks, agents_conv_pdf_url
 
+# Pending remember_response() tasks, referenced so they are not garbage collected mid-flight
+_remember_tasks: Set[asyncio.Task] = set()
+
+def schedule_remember_response(*args: Any) -> None:
+    """
+    Run remember_response() in the background; it waits for the report upload, which
+    must not delay the response.
+    """
+    task = asyncio.create_task(remember_response(*args))
+    _remember_tasks.add(task)
+    task.add_done_callback(_remember_tasks.discard)
+
+async def remember_response(
+    user_prompt: str,
+    prompt_embedding: Optional[Any],
+    cache_scope: str,
+    final_response: str,
+    all_context_chunks: List[str],
+    agents_conv_pdf_url: Optional[str]
+) -> None:
+    """
+    Write a freshly generated result back to the response caches (see tools/semantic_cache.py).
+
+    Does nothing when no data was found (agents_conv_pdf_url is None), so that questions
+    about newly indexed reports are not answered from a stale "no data" entry. The
+    semantic tier is skipped when the prompt could not be embedded (prompt_embedding is None).
+
+    The report PDF is uploaded by a background job after the URL has been returned; the
+    result is only cached once that upload succeeded, so cache hits never hand out the
+    URL of a report that does not exist.
+    """
+    if agents_conv_pdf_url is None:
+        return
+
+    if not await wait_for_report(agents_conv_pdf_url):
+        logger.warning("Not caching response, its report was not uploaded: %s", agents_conv_pdf_url)
+        return
+
+    cache_value = {
+        "response": final_response,
+        "references": all_context_chunks,
+        "agents_conv_pdf_url": agents_conv_pdf_url
+    }
+    exact_response_cache.store(user_prompt, cache_value, cache_scope)
+
+    if prompt_embedding is None:
+        return
+
+    semantic_scope = prompt_scope(user_prompt, cache_scope)
+    response_cache.store(prompt_embedding, cache_value, semantic_scope)
+    await persist_semantic_cache_entry(connection_for_cache, user_prompt, prompt_embedding, cache_value, semantic_scope)
+
+async def single_chunk_stream(text: str) -> AsyncIterator[str]:
+    """
+    Wrap an already complete response (e.g. a cache hit) as a one-chunk token stream.
+    """
+    yield text
+
+def resolve_conversation_id(request: ChatRequest) -> str:
+    """
+    Return the conversation ID for a chat request, generating a new one when needed.
+
+    A new conversation_id is generated in these cases:
+    1. new_session is True
+    2. conversation_id is missing
+    3. conversation_id is "string" (default value in Swagger UI)
+    """
+    if request.new_session or not request.conversation_id or request.conversation_id == "string":
+        return uuid.uuid4().hex
+    return request.conversation_id
+
 @app.post("/chat")
-async def chat(request: ChatRequest) -> Dict[str, Any]:
+async def chat(request: ChatRequest, background_tasks: BackgroundTasks) -> Dict[str, Any]:
     """
     Main chat endpoint that processes user queries through the agentic system.
     
@@ -171,6 +415,7 @@ async def chat(request: ChatRequest) -> Dict[str, Any]:
     
     Args:
         request (ChatRequest): Contains user_prompt, conversation_id, and new_session flag
+        background_tasks (BackgroundTasks): Runs the conversation write after the response is sent
         
     Returns:
         Dict[str, Any]: JSON response containing:
@@ -185,22 +430,17 @@ async def chat(request: ChatRequest) -> Dict[str, Any]:
         - agents/director_agent.py: Generates final response (via agentic flow)
         - tools/conv_to_pdf_handler.py: Creates downloadable PDF summary
     """
-    # Generate new conversation_id in these cases:
-    # 1. new_session is True
-    # 2. conversation_id is missing
-    # 3. conversation_id is "string" (default value in Swagger UI)
-    if request.new_session or not request.conversation_id or request.conversation_id == "string":
-        conversation_id = str(uuid.uuid4())
-    else:
-        conversation_id = request.conversation_id
+    # Reuse the conversation_id or start a new session
+    conversation_id = resolve_conversation_id(request)
     
     # Execute the complete agentic workflow
     model_response, all_context_chunks, agents_conv_pdf_url = await agentic_flow(request.user_prompt, conversation_id)
     
     # Persist the conversation to database using tools/conv_handler.py
-    await inserting_chat_buffer(conversation_id, connection, request.user_prompt, model_response, all_context_chunks)
+    # The write runs after the response has been sent, so it never adds to latency
+    background_tasks.add_task(inserting_chat_buffer, conversation_id, connection, request.user_prompt, model_response, all_context_chunks)
     
-    print(f"conversation id :{conversation_id}")
+    logger.debug("conversation id : %s", conversation_id)
 
     # Return structured response with all relevant data
     return {
@@ -210,6 +450,106 @@ async def chat(request: ChatRequest) -> Dict[str, Any]:
         "agents_conv_pdf_url" : agents_conv_pdf_url
     }
 
+@app.post("/chat/batch")
+async def chat_batch(requests: List[ChatRequest], background_tasks: BackgroundTasks) -> List[Dict[str, Any]]:
+    """
+    Batch chat endpoint: processes several prompts in one HTTP call.
+    
+    The conversation histories of all prompts are loaded with a single MongoDB
+    query and the agentic workflows run concurrently, sharing the pooled Azure
+    OpenAI and MongoDB connections.
+    
+    Args:
+        requests (List[ChatRequest]): Chat requests, each handled like a /chat call
+        background_tasks (BackgroundTasks): Runs the conversation writes after the response is sent
+        
+    Returns:
+        List[Dict[str, Any]]: One /chat response per request, in request order
+        
+    Related Files:
+        - tools/conv_handler.py: conv_histories() loads all histories in one query
+    """
+    conversation_ids = [resolve_conversation_id(request) for request in requests]
+    histories = await conv_histories(conversation_ids, connection, chat_history_retrieval_limit)
+
+    results = await asyncio.gather(*[
+        agentic_flow(request.user_prompt, conversation_id, provided_conversation_history=histories[conversation_id])
+        for request, conversation_id in zip(requests, conversation_ids)
+    ])
+
+    responses = []
+    for request, conversation_id, (model_response, all_context_chunks, agents_conv_pdf_url) in zip(requests, conversation_ids, results):
+        background_tasks.add_task(inserting_chat_buffer, conversation_id, connection, request.user_prompt, model_response, all_context_chunks)
+        responses.append({
+            "response": model_response,
+            "references": all_context_chunks,
+            "conversation_id": conversation_id,
+            "agents_conv_pdf_url": agents_conv_pdf_url
+        })
+
+    return responses
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Streaming chat endpoint: same workflow as /chat, but the director response is
+    delivered as Server-Sent Events while it is being generated.
+    
+    Event stream format:
+        - event "meta": {"conversation_id", "references", "agents_conv_pdf_url"}, sent first
+        - unnamed events: {"token": "..."} for each text delta of the response
+        - event "done": sent after the last token
+        
+    Args:
+        request (ChatRequest): Contains user_prompt, conversation_id, and new_session flag
+        
+    Returns:
+        StreamingResponse: text/event-stream response
+        
+    Related Files:
+        - agents/director_agent.py: director_stream() produces the token stream
+        - tools/conv_handler.py: Persists the conversation once the stream has finished
+    """
+    conversation_id = resolve_conversation_id(request)
+
+    # Manager and workers run before the stream starts; only the director streams
+    token_stream, all_context_chunks, agents_conv_pdf_url = await agentic_flow(request.user_prompt, conversation_id, stream=True)
+
+    async def event_stream() -> AsyncIterator[str]:
+        response_parts = []
+        try:
+            meta = {
+                "conversation_id": conversation_id,
+                "references": all_context_chunks,
+                "agents_conv_pdf_url": agents_conv_pdf_url
+            }
+            yield f"event: meta\ndata: {orjson.dumps(meta).decode()}\n\n"
+
+            async for token in token_stream:
+                response_parts.append(token)
+                yield f"data: {orjson.dumps({'token': token}).decode()}\n\n"
+
+            yield "event: done\ndata: {}\n\n"
+        finally:
+            # Persist after the last byte is sent so the write never delays the stream
+            await inserting_chat_buffer(conversation_id, connection, request.user_prompt, "".join(response_parts), all_context_chunks)
+            logger.debug("conversation id : %s", conversation_id)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.get("/cache/stats")
+async def cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Report size and hit/miss counters of the response caches used by agentic_flow().
+    
+    Returns:
+        Dict[str, Dict[str, int]]: {"exact": {...}, "semantic": {...}} with entries, hits and misses
+    """
+    return {
+        "exact": {"entries": len(exact_response_cache), "hits": exact_response_cache.hits, "misses": exact_response_cache.misses},
+        "semantic": {"entries": len(response_cache), "hits": response_cache.hits, "misses": response_cache.misses}
+    }
+
 @app.post("/feedback")
 async def handle_feedback(request: FeedbackRequest) -> Dict[str, str]:
     """
@@ -232,7 +572,7 @@ async def handle_feedback(request: FeedbackRequest) -> Dict[str, str]:
         return {"message": "Feedback cannot be empty"}
     
     if request.new_session or not request.conversation_id or request.conversation_id == "string":
-        conversation_id = str(uuid.uuid4())
+        conversation_id = uuid.uuid4().hex
     else:
         conversation_id = request.conversation_id
 
@@ -241,17 +581,16 @@ async def handle_feedback(request: FeedbackRequest) -> Dict[str, str]:
         "Insideout": conversation_id,  # Shard key
         "conversation_id": conversation_id,
         "feedback": request.feedback,
-        "timestamp": datetime.datetime.now().strftime("%H:%M:%S")
+        "timestamp": datetime.datetime.now(datetime.timezone.utc)
     }
     
     try:
         await connection_for_feedback.insert_one(feedback_doc)
         
-        print("\n--- FEEDBACK RECEIVED ---")
-        # print(f"Conversation ID: {conversation_id}")
+        logger.info("Feedback received for conversation %s", conversation_id)
         return {"message": "Feedback received and stored successfully!"}
     except Exception as e:
-        print(f"\n--- FEEDBACK ERROR ---")
+        logger.exception("Failed to store feedback")
         return {"message": f"Failed to store feedback: {str(e)}"}
 
 
@@ -10,15 +10,17 @@ Key Responsibilities:
 - Retrieve conversation history for context
 - Manage agent conversation data for internal tracking
 - Format conversation data for different use cases
+- Keep a write-through in-process cache of recent turns so history reads skip MongoDB
 
 Dependencies:
 - MongoDB (Azure Cosmos DB): Primary data storage
 - PyMongo: Database driver for async operations
 
 Related Files:
-- app.py: Uses conv_history() and inserting_chat_buffer() for user conversations
-- agents/sub_question_handler.py: Uses inserting_agent_chat_buffer() for agent data
-- agents/director_agent.py: Uses get_agents_conv_history() and get_agents_total_conv_history()
+- app.py: Uses conv_history() and inserting_chat_buffer() for user conversations,
+  ensure_chat_history_indexes() on startup and chat_buffer_flusher() as a background task
+- agentic.py: Uses inserting_agent_chat_buffer_bulk() for agent data
+- agents/director_agent.py: Uses get_agents_total_qa_pairs() for the conversation report
 - tools/conv_to_pdf_handler.py: Uses conversation data for PDF generation
 
 External Dependencies:
@@ -27,9 +29,105 @@ External Dependencies:
 """
 
 import os
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple, Deque
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING
+from pymongo.write_concern import WriteConcern
+
+logger = logging.getLogger(__name__)
+
+# Write-through cache of the most recent (user_prompt, model_response) turns per
+# conversation. conv_history() fills it on first read and inserting_chat_buffer()
+# appends to it, so follow-up requests served by this process never read MongoDB.
+# Each process has its own cache: run a single worker per conversation (sticky
+# sessions) when using several uvicorn workers.
+history_cache_turns = 10
+history_cache_conversations = 1024
+
+# Chat and agent documents older than this are purged by a MongoDB TTL index;
+# 0 keeps them forever
+chat_history_ttl_days = int(os.getenv("CHAT_HISTORY_TTL_DAYS", "30"))
+
+# Chat documents are not needed to answer the current request (the history cache
+# above already has the turn), so inserting_chat_buffer() only queues them and
+# chat_buffer_flusher() writes them in batches of up to chat_flush_batch_size,
+# at most chat_flush_interval seconds after the first one was queued.
+# The writes are unacknowledged (w=0) unless CHAT_HISTORY_ACKNOWLEDGED_WRITES is set.
+chat_flush_batch_size = 32
+chat_flush_interval = 0.1
+chat_write_concern = WriteConcern(w=1 if os.getenv("CHAT_HISTORY_ACKNOWLEDGED_WRITES", "false").lower() == "true" else 0)
+chat_write_queue: "asyncio.Queue[Tuple[AsyncIOMotorCollection, Dict[str, Any]]]" = asyncio.Queue()
+_history_cache: "OrderedDict[str, Deque[Tuple[str, str]]]" = OrderedDict()
+
+def _cache_history(conversation_id: str, turns: List[Tuple[str, str]]) -> None:
+    """
+    Store the most recent turns of a conversation, evicting the least recently used one.
+    """
+    _history_cache[conversation_id] = deque(turns, maxlen=history_cache_turns)
+    _history_cache.move_to_end(conversation_id)
+    if len(_history_cache) > history_cache_conversations:
+        _history_cache.popitem(last=False)
+
+def _cached_history(conversation_id: str, chat_history_retrieval_limit: int) -> Optional[List[Tuple[str, str]]]:
+    """
+    Return the last chat_history_retrieval_limit cached turns, or None on a cache miss.
+    """
+    turns = _history_cache.get(conversation_id)
+    if turns is None or chat_history_retrieval_limit > history_cache_turns:
+        return None
+    _history_cache.move_to_end(conversation_id)
+    return list(turns)[-chat_history_retrieval_limit:] if chat_history_retrieval_limit else []
+
+def _format_chat_history(turns: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    """
+    Format (user_prompt, model_response) turns as alternating user/assistant messages.
+    """
+    provided_conversation_history = []
+    for user_message, ai_message in turns:
+        provided_conversation_history.append({"role": "user", "content": user_message})
+        provided_conversation_history.append({"role": "assistant", "content": ai_message})
+    return provided_conversation_history
+
+async def ensure_chat_history_indexes(collection: AsyncIOMotorCollection) -> None:
+    """
+    Create the compound (id, timestamp) index used by conv_history() and
+    get_agents_conv_history(), the (tid, timestamp) index used by
+    get_agents_total_qa_pairs(), and the TTL index that purges old chat and agent documents.
+
+    Index creation is idempotent, so this is safe to run on every startup. Failures
+    (e.g. insufficient permissions on the Cosmos account) are logged and ignored,
+    since queries still work without the index, only slower.
+
+    The TTL index is created on the BSON date "timestamp" field. Cosmos DB (RU) only
+    accepts TTL indexes on its "_ts" system field, so that is tried when the
+    first attempt is rejected.
+
+    Args:
+        collection (AsyncIOMotorCollection): MongoDB collection containing conversations
+
+    Related Files:
+        - app.py: Calls this on application startup
+    """
+    for keys in ([("id", ASCENDING), ("timestamp", DESCENDING)], [("tid", ASCENDING), ("timestamp", ASCENDING)]):
+        try:
+            await collection.create_index(keys)
+        except Exception as e:
+            logger.warning("Could not create chat history index %s: %s", keys, e)
+
+    if chat_history_ttl_days <= 0:
+        return
+
+    ttl_seconds = chat_history_ttl_days * 24 * 60 * 60
+    for ttl_field in ("timestamp", "_ts"):
+        try:
+            await collection.create_index(ttl_field, expireAfterSeconds=ttl_seconds)
+            return
+        except Exception as e:
+            logger.warning("Could not create chat history TTL index on %s: %s", ttl_field, e)
 
 async def inserting_chat_buffer(
     conversation_id: str, 
@@ -39,11 +137,12 @@ async def inserting_chat_buffer(
     reference_points: List[str]
 ) -> None:
     """
-    Insert user conversation data into the MongoDB collection.
+    Queue user conversation data for insertion into the MongoDB collection.
     
     This function persists user interactions with the system, including the
     user's question, the final model response, and reference materials used.
-    Essential for maintaining conversation context across sessions.
+    Essential for maintaining conversation context across sessions. The document
+    is written in a batch by chat_buffer_flusher(), so this never waits for MongoDB.
     
     Args:
         conversation_id (str): Unique identifier for the conversation session
@@ -57,6 +156,7 @@ async def inserting_chat_buffer(
         
     Related Files:
         - app.py: Calls this function after agentic workflow completion
+        - chat_buffer_flusher(): Writes the queued document
         - agents/director_agent.py: Provides model_response (via app.py)
         - tools/v_search.py: Provides reference_points (via agent workflow)
         
@@ -64,18 +164,85 @@ async def inserting_chat_buffer(
         - id: conversation_id for grouping related messages
         - user_prompt: User's input message
         - model_response: System's final response
-        - timestamp: UTC timestamp for chronological ordering
+        - timestamp: UTC timestamp (BSON date) for chronological ordering
         - references: Source materials used for response generation
     """
+    # Keep the in-process history cache current (write-through)
+    if conversation_id in _history_cache:
+        _history_cache[conversation_id].append((user_prompt, model_response))
+
     # Insert a chat document into the collection
     chat_history_doc = {
         "id": conversation_id,
         "user_prompt": user_prompt,
         "model_response": model_response,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc),
         "references": reference_points
     }
-    await collection.insert_one(chat_history_doc)
+    chat_write_queue.put_nowait((collection, chat_history_doc))
+
+async def chat_buffer_flusher() -> None:
+    """
+    Background task writing the chat documents queued by inserting_chat_buffer().
+
+    Waits for the first queued document, collects whatever else arrives within
+    chat_flush_interval seconds (up to chat_flush_batch_size documents) and writes
+    them with one unordered insert_many() per collection. Failed batches are logged
+    and dropped; the history cache still holds those turns for this process.
+
+    When cancelled (on shutdown), the documents already taken off the queue are
+    written before the task stops. insert_many() assigns each document its _id before
+    sending it, so documents of a batch interrupted mid-write are not duplicated.
+
+    Related Files:
+        - app.py: Starts this task on startup and stops it and drains the queue on shutdown
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = []
+        try:
+            batch.append(await chat_write_queue.get())
+            deadline = loop.time() + chat_flush_interval
+            while len(batch) < chat_flush_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(chat_write_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await _insert_chat_batch(batch)
+        except asyncio.CancelledError:
+            await _insert_chat_batch(batch)
+            raise
+        finally:
+            for _ in batch:
+                chat_write_queue.task_done()
+
+async def flush_chat_buffer() -> None:
+    """
+    Write every chat document still queued, e.g. on shutdown after the flusher was stopped.
+    """
+    batch = []
+    while not chat_write_queue.empty():
+        batch.append(chat_write_queue.get_nowait())
+        chat_write_queue.task_done()
+    await _insert_chat_batch(batch)
+
+async def _insert_chat_batch(batch: List[Tuple[AsyncIOMotorCollection, Dict[str, Any]]]) -> None:
+    """
+    Insert queued chat documents with one insert_many() per target collection.
+    """
+    docs_by_collection: Dict[str, Tuple[AsyncIOMotorCollection, List[Dict[str, Any]]]] = {}
+    for collection, chat_history_doc in batch:
+        docs_by_collection.setdefault(collection.full_name, (collection, []))[1].append(chat_history_doc)
+
+    for collection, chat_history_docs in docs_by_collection.values():
+        try:
+            await collection.with_options(write_concern=chat_write_concern).insert_many(chat_history_docs, ordered=False)
+        except Exception as e:
+            logger.warning("Failed to write %d chat history documents: %s", len(chat_history_docs), e)
 
 async def conv_history(
     conversation_id: str, 
@@ -103,22 +270,88 @@ async def conv_history(
         - agents/director_agent.py: Uses conversation context for response synthesis
         
     Data Flow:
-        1. Retrieve all messages for the conversation_id
-        2. Limit to most recent messages based on chat_history_retrieval_limit
+        1. Return the cached turns if this process already holds the conversation
+        2. Otherwise retrieve the most recent messages for the conversation_id,
+           newest first (served by the (id, timestamp) index), and cache them
         3. Format as alternating user/assistant messages for LLM context
     """
-    chat_history_retrieved = await collection.find({"id": conversation_id}).to_list(length=None)
-    
-    recent_chat_history = chat_history_retrieved[-chat_history_retrieval_limit:] if chat_history_retrieved else []
-    provided_conversation_history = []
+    # Served from the in-process cache when this process has seen the conversation
+    cached_turns = _cached_history(conversation_id, chat_history_retrieval_limit)
+    if cached_turns is not None:
+        return _format_chat_history(cached_turns)
+
+    # Let the server pick the newest turns via the (id, timestamp) index and only send
+    # the two fields we use, instead of decoding the whole conversation client-side
+    fetch_limit = max(chat_history_retrieval_limit, history_cache_turns)
+    cursor = collection.find(
+        {"id": conversation_id},
+        projection={"user_prompt": 1, "model_response": 1, "_id": 0}
+    ).sort("timestamp", -1).limit(fetch_limit)
+    chat_history_retrieved = await cursor.to_list(length=fetch_limit)
     
-    for doc in recent_chat_history:
-        user_message = doc.get("user_prompt", "")
-        ai_message = doc.get("model_response", "")
-        provided_conversation_history.append({"role": "user", "content": user_message})
-        provided_conversation_history.append({"role": "assistant", "content": ai_message})
+    # Restore chronological order
+    turns = [(doc.get("user_prompt", ""), doc.get("model_response", "")) for doc in reversed(chat_history_retrieved)]
+    _cache_history(conversation_id, turns)
+
+    return _format_chat_history(turns[-chat_history_retrieval_limit:] if chat_history_retrieval_limit else [])
+
+async def conv_histories(
+    conversation_ids: List[str], 
+    collection: AsyncIOMotorCollection, 
+    chat_history_retrieval_limit: int
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Retrieve the conversation history of several conversations with one query.
+
+    Batch variant of conv_history(): conversations held in the in-process cache are
+    served from it, and a single $in query replaces one round trip per remaining
+    conversation; the newest turns of each conversation are picked client-side.
     
-    return provided_conversation_history
+    Args:
+        conversation_ids (List[str]): Conversation sessions to load
+        collection (AsyncIOMotorCollection): MongoDB collection containing conversations
+        chat_history_retrieval_limit (int): Maximum number of previous messages per conversation
+        
+    Returns:
+        Dict[str, List[Dict[str, str]]]: conversation_id -> history in conv_history() format
+            (an empty list for conversations without stored turns)
+            
+    Related Files:
+        - app.py: Calls this from the /chat/batch endpoint
+    """
+    provided_conversation_histories = {}
+    missing_ids = []
+    for conversation_id in conversation_ids:
+        cached_turns = _cached_history(conversation_id, chat_history_retrieval_limit)
+        if cached_turns is not None:
+            provided_conversation_histories[conversation_id] = _format_chat_history(cached_turns)
+        elif conversation_id not in missing_ids:
+            missing_ids.append(conversation_id)
+
+    if not missing_ids:
+        return provided_conversation_histories
+
+    cursor = collection.find(
+        {"id": {"$in": missing_ids}},
+        projection={"id": 1, "user_prompt": 1, "model_response": 1, "_id": 0}
+    ).sort("timestamp", -1)
+
+    # Newest first: keep the first turns of each conversation
+    fetch_limit = max(chat_history_retrieval_limit, history_cache_turns)
+    recent_chat_histories: Dict[str, List[Dict[str, Any]]] = {conversation_id: [] for conversation_id in missing_ids}
+    async for doc in cursor:
+        recent_chat_history = recent_chat_histories[doc["id"]]
+        if len(recent_chat_history) < fetch_limit:
+            recent_chat_history.append(doc)
+
+    for conversation_id, recent_chat_history in recent_chat_histories.items():
+        turns = [(doc.get("user_prompt", ""), doc.get("model_response", "")) for doc in reversed(recent_chat_history)]
+        _cache_history(conversation_id, turns)
+        provided_conversation_histories[conversation_id] = _format_chat_history(
+            turns[-chat_history_retrieval_limit:] if chat_history_retrieval_limit else []
+        )
+
+    return provided_conversation_histories
 
 async def inserting_agent_chat_buffer(
     agents_conversation_id: str, 
@@ -157,18 +390,88 @@ async def inserting_agent_chat_buffer(
         - tid: parent conversation_id for linking to user session
         - sub_question: Manager agent's generated sub-question
         - worker_response: Worker agent's detailed response
-        - timestamp: UTC timestamp for chronological ordering
+        - timestamp: UTC timestamp (BSON date) for chronological ordering
         - references: Context chunks used for response generation
     """
-    chat_history_doc = {
+    chat_history_doc = _agent_chat_doc(agents_conversation_id, conversation_id, sub_question, worker_response, context_chunks)
+    await collection.insert_one(chat_history_doc)
+
+async def inserting_agent_chat_buffer_bulk(
+    agents_conversation_id: str, 
+    conversation_id: str, 
+    collection: AsyncIOMotorCollection, 
+    records: List[Tuple[str, str, List[str]]]
+) -> None:
+    """
+    Persist all sub-question results of one agent conversation in a single round trip.
+
+    Bulk variant of inserting_agent_chat_buffer(): one insert_many() instead of one
+    insert_one() per sub-question. ordered=False lets the server apply the inserts
+    in parallel.
+    
+    Args:
+        agents_conversation_id (str): Unique ID for this specific agent conversation session
+        conversation_id (str): Parent conversation ID linking to user session
+        collection (AsyncIOMotorCollection): MongoDB collection for agent data storage
+        records (List[Tuple[str, str, List[str]]]): (sub_question, worker_response, context_chunks)
+            for every processed sub-question
+        
+    Returns:
+        None
+        
+    Related Files:
+        - agentic.py: Calls this once after all sub-questions are processed
+        - agents/director_agent.py: Retrieves this data via get_agents_total_qa_pairs()
+        
+    Database Schema:
+        Same document shape as inserting_agent_chat_buffer()
+    """
+    if not records:
+        return
+
+    chat_history_docs = [
+        _agent_chat_doc(agents_conversation_id, conversation_id, sub_question, worker_response, context_chunks)
+        for sub_question, worker_response, context_chunks in records
+    ]
+    await collection.insert_many(chat_history_docs, ordered=False)
+
+def _agent_chat_doc(
+    agents_conversation_id: str, 
+    conversation_id: str, 
+    sub_question: str, 
+    worker_response: str, 
+    context_chunks: List[str]
+) -> Dict[str, Any]:
+    """
+    Build the MongoDB document for one manager/worker exchange.
+    """
+    return {
         "id": agents_conversation_id,
         "tid": conversation_id,
         "sub_question": sub_question,
         "worker_response": worker_response,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc),
         "references": context_chunks
     }
-    await collection.insert_one(chat_history_doc)
+
+def format_agent_exchange(sub_question: str, worker_response: str) -> List[Dict[str, str]]:
+    """
+    Format one manager/worker exchange as the role pair consumed by the director.
+
+    Shared by the database readers below and by agentic.py, which builds the
+    current request's agent history in memory instead of reading it back.
+
+    Args:
+        sub_question (str): Sub-question asked by the manager agent
+        worker_response (str): Worker agent's answer to the sub-question
+
+    Returns:
+        List[Dict[str, str]]: [{"role": "manager_agent", ...}, {"role": "worker_agent", ...}]
+    """
+    return [
+        {"role": "manager_agent", "content": f"subquestion = {sub_question}"},
+        {"role": "worker_agent", "content": f"answer ={worker_response}"}
+    ]
 
 async def get_agents_conv_history(
     agents_conversation_id: str, 
@@ -191,7 +494,7 @@ async def get_agents_conv_history(
             
     Related Files:
         - agents/director_agent.py: Primary consumer for response synthesis context
-        - agents/sub_question_handler.py: Populates the data this function retrieves
+        - agentic.py: Populates the data this function retrieves via inserting_agent_chat_buffer_bulk()
         - agentic.py: Coordinates the workflow that generates this conversation data
         
     Data Flow:
@@ -199,66 +502,68 @@ async def get_agents_conv_history(
         2. Format as manager_agent/worker_agent role pairs
         3. Provide structured context for director agent synthesis
     """
-    chat_history_retrieved = await collection.find({"id": agents_conversation_id}).to_list(length=None)
+    # Served by the (id, timestamp) index; only the two fields that are formatted
+    # are fetched, not the stored context chunks
+    cursor = collection.find(
+        {"id": agents_conversation_id},
+        {"_id": 0, "sub_question": 1, "worker_response": 1}
+    ).sort("timestamp", ASCENDING).batch_size(200)
+    chat_history_retrieved = await cursor.to_list(length=None)
 
-    recent_chat_history = chat_history_retrieved if chat_history_retrieved else []
     provided_conversation_history = []
     
-    for doc in recent_chat_history:
-        manager_agent_message = doc.get("sub_question", "")
-        worker_agent_message = doc.get("worker_response", "")
-        provided_conversation_history.append({"role": "manager_agent", "content": f"subquestion = {manager_agent_message}"})
-        provided_conversation_history.append({"role": "worker_agent", "content": f"answer ={worker_agent_message}"})
+    for doc in chat_history_retrieved:
+        provided_conversation_history.extend(
+            format_agent_exchange(doc.get("sub_question", ""), doc.get("worker_response", ""))
+        )
 
     return provided_conversation_history
 
-async def get_agents_total_conv_history(
+async def get_agents_total_qa_pairs(
     conversation_id: str, 
     collection: AsyncIOMotorCollection
 ) -> List[Dict[str, str]]:
     """
-    Retrieve complete agent conversation history for PDF generation.
+    Retrieve every sub-question/answer pair of a conversation for PDF generation.
     
     This function fetches all agent interactions across all sub-questions
     for a given user conversation, used primarily for comprehensive PDF reports.
+    The pairing is done by MongoDB: an aggregation projects each stored exchange
+    straight to a question/answer pair, so only those two fields cross the wire
+    (not the stored context chunks) and no manager/worker role messages have to be
+    built and paired up again in Python.
     
     Args:
         conversation_id (str): Parent conversation ID for the user session
         collection (AsyncIOMotorCollection): MongoDB collection containing agent data
         
     Returns:
-        List[Dict[str, str]]: Complete formatted agent conversation history
-            Format: [{"role": "manager_agent", "content": "subquestion = ..."}, 
-                    {"role": "worker_agent", "content": "answer = ..."}]
+        List[Dict[str, str]]: Sub-question/answer pairs in timestamp order
+            Format: [{"question": "...", "answer": "..."}]
             
     Related Files:
         - agents/director_agent.py: Uses this for PDF generation coordination
         - tools/conv_to_pdf_handler.py: Primary consumer for comprehensive PDF reports
-        - agents/sub_question_handler.py: Populates the underlying data
+        - agentic.py: Populates the underlying data via inserting_agent_chat_buffer_bulk()
         
     Data Flow:
-        1. Retrieve all agent interactions with matching conversation_id (via tid field)
-        2. Include all sub-question/answer pairs across the entire session
-        3. Format for PDF report generation with complete workflow transparency
+        1. Match all agent interactions with the conversation_id (via tid field)
+        2. Sort them by timestamp (served by the (tid, timestamp) index)
+        3. Project each one to a question/answer pair server-side
+        4. Hand the pairs directly to the PDF builders
     """
-    chat_history_retrieved = await collection.find({"tid": conversation_id}).to_list(length=None)
-
-    recent_chat_history = chat_history_retrieved if chat_history_retrieved else []
-    provided_conversation_history = []
-    
-    for doc in recent_chat_history:
-        manager_agent_message = doc.get("sub_question", "")
-        worker_agent_message = doc.get("worker_response", "")
-        provided_conversation_history.append({"role": "manager_agent", "content": f"subquestion = {manager_agent_message}"})
-        provided_conversation_history.append({"role": "worker_agent", "content": f"answer ={worker_agent_message}"})
-
-    return provided_conversation_history
+    pipeline = [
+        {"$match": {"tid": conversation_id}},
+        {"$sort": {"timestamp": ASCENDING}},
+        {"$project": {"_id": 0, "question": "$sub_question", "answer": "$worker_response"}}
+    ]
+    return await collection.aggregate(pipeline).to_list(length=None)
 
 def monolog(provided_conversation_history: List[Dict[str, str]]) -> None:
     """
-    Debug utility to display agent conversation history in console.
+    Debug utility to log agent conversation history.
     
-    This function provides a formatted console output of agent interactions
+    This function logs a formatted dump of agent interactions at DEBUG level
     for debugging and development purposes, helping visualize the agent workflow.
     
     Args:
@@ -274,20 +579,21 @@ def monolog(provided_conversation_history: List[Dict[str, str]]) -> None:
         
     Related Files:
         - agents/director_agent.py: Contains commented call to this function
-        - Used with data from get_agents_conv_history() or get_agents_total_conv_history()
+        - Used with data from get_agents_conv_history() or format_agent_exchange()
     """
-    print("INTERNAL MONOLOG : ")
-    print("*****************************************************************************")
-    c=0
+    # Agent exchanges can be long; skip building the dump unless debug logging is on
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    lines = ["INTERNAL MONOLOG : ", "*****************************************************************************"]
     for i in provided_conversation_history:
         if i['role'] == 'manager_agent':
             prefix = "⚪" 
         elif i['role'] == 'worker_agent':
             prefix = "⚫"
-        print(f"{prefix} : {i['content']}") 
-        
-        c+=1
-    print("*****************************************************************************")
+        lines.append(f"{prefix} : {i['content']}")
+    lines.append("*****************************************************************************")
+    logger.debug("\n".join(lines))
 
 def get_best_worker_response(conversation_history: List[Dict[str, str]]) -> str:
     """
@@ -311,14 +617,13 @@ def get_best_worker_response(conversation_history: List[Dict[str, str]]) -> str:
         - Currently unused in the main workflow
         - May be relevant for future agent scoring/selection features
     """
-    c=0
-    max_score = 0
-    max_at = 0
-    
-    for i in range(len(conversation_history)):
-        if conversation_history[i]['role'] == "score" and conversation_history[i]["content"] > max_score:
-            max_score = conversation_history[i]["content"]
-            max_at = i
+    # Single pass over the positive scores; max() keeps the first of equal scores and
+    # falls back to index 0 when there are none, as the previous loop did
+    max_at = max(
+        (i for i, message in enumerate(conversation_history) if message["role"] == "score" and message["content"] > 0),
+        key=lambda i: conversation_history[i]["content"],
+        default=0
+    )
 
     return conversation_history[max_at-2]['content']
 
@@ -28,8 +28,14 @@ External Dependencies:
 """
 
 import os
+import logging
+import io
 import asyncio
-from typing import List, Dict, Tuple, Any
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Any, Optional, Awaitable
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -38,18 +44,114 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 from datetime import datetime
 import re
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob import BlobServiceClient, ContentSettings
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Blob storage configuration
 # Used for uploading generated PDF reports
 container_name = os.getenv("BLOB_CONTAINER_FOR_REPORT")
 connection_string=os.getenv("STORAGE_ACCOUNT_CONNECTION_STRING")
-# print("*****************")
-# print(connection_string)
-# print("*****************")
+
+@lru_cache(maxsize=1)
+def get_blob_service_client() -> BlobServiceClient:
+    """
+    Return the BlobServiceClient shared by all report uploads, creating it on first use.
+
+    Blob clients derived from it share its HTTP pipeline, so every upload reuses the
+    same pooled keep-alive connections instead of opening a new TLS connection.
+    """
+    return BlobServiceClient.from_connection_string(connection_string)
+
+# ReportLab rendering is pure-Python CPU work; in a thread it still holds the GIL and
+# slows every coroutine of the server, so the PDFs are rendered in separate processes
+pdf_render_processes = int(os.getenv("PDF_RENDER_PROCESSES", "2"))
+
+@lru_cache(maxsize=1)
+def get_pdf_process_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool used to render report PDFs, creating it on first use.
+
+    The server process runs several threads (the HTTP connection pools, Motor's monitor
+    threads, asyncio.to_thread workers), so the rendering processes are spawned rather
+    than forked: a forked child could inherit a lock held by one of those threads and
+    deadlock while rendering.
+
+    Related Files:
+        - app.py: Creates the pool in lifespan() on startup
+    """
+    return ProcessPoolExecutor(max_workers=pdf_render_processes, mp_context=multiprocessing.get_context("spawn"))
+
+def shutdown_pdf_process_pool() -> None:
+    """
+    Stop the PDF rendering processes, if the pool was ever started.
+
+    Related Files:
+        - app.py: Calls this in lifespan() on shutdown
+    """
+    if get_pdf_process_pool.cache_info().currsize:
+        get_pdf_process_pool().shutdown(wait=False, cancel_futures=True)
+        get_pdf_process_pool.cache_clear()
+
+# Queue of pending report jobs and their outcome futures, drained by report_worker()
+# outside the request path
+report_queue: "asyncio.Queue[Tuple[Awaitable[Any], asyncio.Future]]" = asyncio.Queue()
+# Outcome (uploaded or not) of queued reports by report URL, awaited by wait_for_report();
+# bounded so outcomes nobody waits for do not accumulate
+_report_results: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+max_tracked_reports = 1024
+# Report jobs run concurrently, one per PDF rendering process, so the pool stays busy under load
+report_worker_count = int(os.getenv("REPORT_WORKERS", str(pdf_render_processes)))
+# On shutdown, queued reports (whose URLs were already returned) get this long to finish
+report_drain_timeout = float(os.getenv("REPORT_DRAIN_TIMEOUT_SECONDS", "30"))
+
+# Markdown patterns used by markdown_to_reportlab(), compiled once at import
+_HEADER_RE = re.compile(r'(#{1,3}) (.*?)\n')
+_HEADER_SIZES = {1: 16, 2: 14, 3: 12}
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.*?)\*')
+_BULLET_RE = re.compile(r'- (.*?)\n')
+_NUMBERED_RE = re.compile(r'(\d+)\. (.*?)\n')
+_DOC_REF_RE = re.compile(r'\[(doc\d+)\]')
+
+# Report styles and spacers, built once at import instead of for every PDF.
+# Styles are only read while rendering and Spacer keeps no per-document state,
+# so the same objects are shared by every report (and reused within a story).
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = _STYLES["Title"]
+_ANSWER_STYLE = ParagraphStyle(
+    'AnswerStyle',
+    parent=_STYLES['BodyText'],
+    spaceBefore=6,
+    spaceAfter=12,
+    leftIndent=20,
+    fontSize=10
+)
+_QUESTION_STYLE = ParagraphStyle(
+    'QuestionStyle',
+    parent=_STYLES['Heading2'],
+    spaceBefore=10,
+    fontSize=12,
+    textColor=colors.black
+)
+_DISCRIPTION_STYLE = ParagraphStyle(
+    'DiscriptionStyle',
+    parent=_STYLES['BodyText'],
+    spaceBefore=6,
+    fontSize=8,
+    textColor=colors.gray
+)
+_SECTION_SPACER = Spacer(1, 0.25*inch)
+_ITEM_SPACER = Spacer(1, 0.2*inch)
+
+def _header_markup(match: "re.Match[str]") -> str:
+    """
+    Render a #, ## or ### header match with the matching font size.
+    """
+    return f'<font face="Helvetica-Bold" size="{_HEADER_SIZES[len(match.group(1))]}">{match.group(2)}</font><br/>'
 
 def markdown_to_reportlab(text: str) -> str:
     """
@@ -76,36 +178,33 @@ def markdown_to_reportlab(text: str) -> str:
         - Used by _conversation_to_pdf_sync() for formatting agent responses
         - Processes text from tools/conv_handler.py conversation data
     """
-    # Convert headers
-    text = re.sub(r'### (.*?)\n', r'<font face="Helvetica-Bold" size="12">\1</font><br/>', text)
-    text = re.sub(r'## (.*?)\n', r'<font face="Helvetica-Bold" size="14">\1</font><br/>', text)
-    text = re.sub(r'# (.*?)\n', r'<font face="Helvetica-Bold" size="16">\1</font><br/>', text)
+    # Convert headers (all three levels in one pass)
+    text = _HEADER_RE.sub(_header_markup, text)
     
     # Convert bold text
-    text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
+    text = _BOLD_RE.sub(r'<b>\1</b>', text)
     
     # Convert italic text
-    text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
+    text = _ITALIC_RE.sub(r'<i>\1</i>', text)
     
     # Convert bullet points
-    text = re.sub(r'- (.*?)\n', r'• \1<br/>', text)
+    text = _BULLET_RE.sub(r'• \1<br/>', text)
     
     # Convert numbered lists
-    text = re.sub(r'(\d+)\. (.*?)\n', r'\1. \2<br/>', text)
+    text = _NUMBERED_RE.sub(r'\1. \2<br/>', text)
     
     # Handle line breaks
     text = text.replace('\n', '<br/>')
     
     # Handle document references like [doc1], [doc2]
-    text = re.sub(r'\[(doc\d+)\]', r'<i>[\1]</i>', text)
+    text = _DOC_REF_RE.sub(r'<i>[\1]</i>', text)
     
     return text
 
 async def conversation_to_pdf(
-    conversation_history: List[Dict[str, str]], 
-    direcotr_response: str,
-    output_dir: str = "./conversation_pdfs"
-) -> str:
+    qa_pairs: List[Dict[str, str]], 
+    direcotr_response: str
+) -> bytes:
     """
     Generate a comprehensive PDF report from conversation history.
     
@@ -114,25 +213,22 @@ async def conversation_to_pdf(
     providing users with detailed documentation of the agentic workflow.
     
     Args:
-        conversation_history (List[Dict[str, str]]): Agent conversation data
-            Format: [{"role": "manager_agent|worker_agent", "content": "..."}]
+        qa_pairs (List[Dict[str, str]]): Sub-question/answer pairs of the conversation
+            Format: [{"question": "...", "answer": "..."}]
         direcotr_response (str): Final synthesized response from director agent
-        output_dir (str): Directory path for saving PDF files (default: "./conversation_pdfs")
         
     Returns:
-        str: File path to the generated PDF document
+        bytes: Content of the generated PDF document
         
     Workflow:
-        1. Create output directory if needed
-        2. Generate timestamped filename
-        3. Format conversation as Q&A pairs
-        4. Apply markdown formatting via markdown_to_reportlab()
-        5. Build structured PDF with ReportLab
-        6. Return file path for upload process
+        1. Number the Q&A pairs
+        2. Apply markdown formatting via markdown_to_reportlab()
+        3. Build structured PDF with ReportLab into an in-memory buffer
+        4. Return the PDF bytes for the upload process
         
     Related Files:
         - agents/director_agent.py: Primary caller for PDF generation
-        - tools/conv_handler.py: Provides conversation_history data
+        - tools/conv_handler.py: Provides qa_pairs via get_agents_total_qa_pairs()
         - upload_pdf_to_blob(): Handles subsequent upload to Azure Blob Storage
         
     PDF Structure:
@@ -142,129 +238,81 @@ async def conversation_to_pdf(
         - Final summary (director response)
     """
     # This function uses the reportlab library which is not async-compatible
-    # Run the CPU-intensive PDF generation in a thread pool to not block the event loop
-    return await asyncio.to_thread(_conversation_to_pdf_sync, conversation_history, direcotr_response, output_dir)
+    # Run the CPU-intensive PDF generation in the process pool to not block the event loop
+    return await asyncio.get_running_loop().run_in_executor(
+        get_pdf_process_pool(), _conversation_to_pdf_sync, qa_pairs, direcotr_response
+    )
 
 def _conversation_to_pdf_sync(
-    conversation_history: List[Dict[str, str]], 
-    direcotr_response: str, 
-    output_dir: str
-) -> str:
+    qa_pairs: List[Dict[str, str]], 
+    direcotr_response: str
+) -> bytes:
     """
     Synchronous PDF generation implementation.
     
     This function contains the actual PDF generation logic using ReportLab,
-    wrapped in asyncio.to_thread() to avoid blocking the async event loop.
+    run in the PDF process pool to avoid blocking the async event loop. It is a
+    module-level function with plain arguments so it can be pickled.
     
     Args:
-        conversation_history (List[Dict[str, str]]): Agent conversation data
+        qa_pairs (List[Dict[str, str]]): Sub-question/answer pairs
         direcotr_response (str): Final director agent response
-        output_dir (str): Directory for PDF output
         
     Returns:
-        str: Generated PDF file path
+        bytes: Generated PDF content
         
     Implementation Details:
         - Uses ReportLab for PDF generation (synchronous library)
-        - Creates custom styles for different content types
+        - Uses the module-level report styles (built once at import)
         - Processes markdown formatting for readable output
-        - Generates timestamped filenames for uniqueness
+        - Renders into memory; the PDF never touches the local disk
         
     Related Files:
         - Called by conversation_to_pdf() for async compatibility
         - Uses markdown_to_reportlab() for text formatting
     """
-    # Create output directory if it doesn't exist
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    
-    # Generate filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"Researched_info_{timestamp}.pdf"
-    filepath = os.path.join(output_dir, filename)
-    
-    # Create PDF document
-    doc = SimpleDocTemplate(filepath, pagesize=letter)
-    styles = getSampleStyleSheet()
-    
-    # Create custom styles
-    answer_style = ParagraphStyle(
-        'AnswerStyle',
-        parent=styles['BodyText'],
-        spaceBefore=6,
-        spaceAfter=12,
-        leftIndent=20,
-        fontSize=10
-    )
-    
-    question_style = ParagraphStyle(
-        'QuestionStyle',
-        parent=styles['Heading2'],
-        spaceBefore=10,
-        fontSize=12,
-        textColor=colors.black
-    )
-
-    discription_style = ParagraphStyle(
-    'DiscriptionStyle',
-    parent=styles['BodyText'],
-    spaceBefore=6,
-    fontSize=8,
-    textColor=colors.gray
-    )
+    # Create PDF document in memory
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
 
     story = []
     
     # Add title
-    title_style = styles["Title"]
-    story.append(Paragraph("Generated Report for your Analysis", title_style))
-    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles["Normal"]))
+    story.append(Paragraph("Generated Report for your Analysis", _TITLE_STYLE))
+    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", _STYLES["Normal"]))
     
     story.append(Paragraph(
         """(Generated Report for your Analysis:
-            This report gives a glimpse of what happened in the backend after you asked your query to the demo tool. The questions below are the broken-down queries that Manager Agent created from your original query. And the answers are that the generated response by the Worker Agent after he retrieved the data from the vector database. The Director Agent collects this report and then responds to your original query, which is added as summary at the end of this report.)""", discription_style))
+            This report gives a glimpse of what happened in the backend after you asked your query to the demo tool. The questions below are the broken-down queries that Manager Agent created from your original query. And the answers are that the generated response by the Worker Agent after he retrieved the data from the vector database. The Director Agent collects this report and then responds to your original query, which is added as summary at the end of this report.)""", _DISCRIPTION_STYLE))
     
-    story.append(Spacer(1, 0.25*inch))  # Add space
-    
-    # Format conversation as numbered Q&A pairs
-    qa_pairs = []
-    current_question = None
-    
-    # Group into Q&A pairs
-    for item in conversation_history:
-        if item['role'] == 'manager_agent':
-            current_question = item['content'].replace("subquestion = ", "")
-
-        elif item['role'] == 'worker_agent':
-            answer = item['content'].replace("answer =", "")
-            qa_pairs.append({'question': current_question, 'answer': answer})
+    story.append(_SECTION_SPACER)  # Add space
     
     # Add numbered Q&A pairs to PDF
     for i, pair in enumerate(qa_pairs, 1):
         # Add question
         question_text = f"{i}. {pair['question']}"
-        story.append(Paragraph(question_text, question_style))
+        story.append(Paragraph(question_text, _QUESTION_STYLE))
         
         # Add answer with indentation, converting markdown to reportlab format
         formatted_answer = markdown_to_reportlab(pair['answer'])
         answer_text = f"{formatted_answer}"
-        story.append(Paragraph(answer_text, answer_style))
+        story.append(Paragraph(answer_text, _ANSWER_STYLE))
         
         # Add spacing between Q&A pairs
-        story.append(Spacer(1, 0.2*inch))
+        story.append(_ITEM_SPACER)
     
     # Symmary (director response)
-    story.append(Paragraph("Summary", question_style))
+    story.append(Paragraph("Summary", _QUESTION_STYLE))
     final_formatted_answer = markdown_to_reportlab(direcotr_response)
-    story.append(Paragraph(final_formatted_answer, answer_style))
-    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph(final_formatted_answer, _ANSWER_STYLE))
+    story.append(_ITEM_SPACER)
     
     # Build PDF
     doc.build(story)
     
-    return filepath
+    return buffer.getvalue()
 
-async def upload_pdf_to_blob(pdf_path: str) -> str:
+async def upload_pdf_to_blob(pdf_bytes: bytes, pdf_filename: str) -> str:
     """
     Upload generated PDF to Azure Blob Storage and return public URL.
     
@@ -272,20 +320,21 @@ async def upload_pdf_to_blob(pdf_path: str) -> str:
     providing users with downloadable links to their conversation summaries.
     
     Args:
-        pdf_path (str): Local file path to the generated PDF document
+        pdf_bytes (bytes): PDF content from conversation_to_pdf()
+        pdf_filename (str): Blob name of the PDF (see report_blob_url())
         
     Returns:
         str: Public URL for accessing the uploaded PDF
         
     Workflow:
-        1. Create Azure Blob Storage client using connection string
-        2. Upload PDF file with overwrite enabled
+        1. Get the shared Azure Blob Storage client (see get_blob_service_client())
+        2. Upload the PDF bytes with overwrite enabled and a PDF content type
         3. Return public blob URL for user access
         4. Enable users to download comprehensive workflow reports
         
     Related Files:
         - agents/director_agent.py: Primary caller after PDF generation
-        - conversation_to_pdf(): Provides pdf_path for upload
+        - conversation_to_pdf(): Provides pdf_bytes for upload
         - app.py: Returns blob URL to users (via director agent)
         
     Configuration:
@@ -294,9 +343,9 @@ async def upload_pdf_to_blob(pdf_path: str) -> str:
         - Requires proper Azure storage account setup and permissions
     """
     # Use a thread pool to run the synchronous blob upload
-    return await asyncio.to_thread(_upload_pdf_to_blob_sync, pdf_path)
+    return await asyncio.to_thread(_upload_pdf_to_blob_sync, pdf_bytes, pdf_filename)
 
-def _upload_pdf_to_blob_sync(pdf_path: str) -> str:
+def _upload_pdf_to_blob_sync(pdf_bytes: bytes, pdf_filename: str) -> str:
     """
     Synchronous Azure Blob Storage upload implementation.
     
@@ -304,7 +353,8 @@ def _upload_pdf_to_blob_sync(pdf_path: str) -> str:
     asyncio.to_thread() to avoid blocking the async event loop.
     
     Args:
-        pdf_path (str): Local file path to the PDF to upload
+        pdf_bytes (bytes): PDF content to upload
+        pdf_filename (str): Blob name of the PDF
         
     Returns:
         str: Public URL of the uploaded blob
@@ -312,28 +362,139 @@ def _upload_pdf_to_blob_sync(pdf_path: str) -> str:
     Implementation Details:
         - Uses Azure Blob Storage SDK (synchronous operations)
         - Overwrites existing blobs with same name
+        - Sets Content-Type application/pdf so browsers open the report inline
         - Returns direct blob URL for user access
-        - Handles file reading and upload in chunks
         
     Related Files:
         - Called by upload_pdf_to_blob() for async compatibility
-        - Used by agents/director_agent.py for file cleanup coordination
     """
-    # Create the BlobServiceClient using the connection string
-    blob_service_client = BlobServiceClient.from_connection_string(connection_string)
-    
-    # Get a blob client
-    blob_client = blob_service_client.get_blob_client(container=container_name, blob=os.path.basename(pdf_path))
+    # Get a blob client from the shared BlobServiceClient (pooled connections)
+    blob_client = get_blob_service_client().get_blob_client(container=container_name, blob=pdf_filename)
 
-    # Upload the file
-    with open(pdf_path, "rb") as pdf_file:
-        blob_client.upload_blob(pdf_file, overwrite=True)
+    # Upload the in-memory PDF
+    blob_client.upload_blob(
+        pdf_bytes,
+        overwrite=True,
+        content_settings=ContentSettings(content_type="application/pdf")
+    )
 
     return blob_client.url  # Return the URL of the uploaded PDF
 
+def report_blob_url(pdf_filename: str) -> str:
+    """
+    Compute the public blob URL a report PDF will be uploaded to.
+
+    The URL only depends on the container and blob name, so it can be handed to the
+    user before the PDF has been rendered and uploaded by the background report job.
+
+    Args:
+        pdf_filename (str): File name of the PDF (used as the blob name)
+
+    Returns:
+        str: Public URL of the blob
+
+    Related Files:
+        - agents/director_agent.py: Returns this URL while the report job runs in the background
+        - _upload_pdf_to_blob_sync(): Uploads to the same blob name
+    """
+    return get_blob_service_client().get_blob_client(container=container_name, blob=pdf_filename).url
+
+def enqueue_report(report_job: Awaitable[Any], report_url: Optional[str] = None) -> None:
+    """
+    Schedule a report job (PDF rendering + upload) to run outside the request path.
+
+    Args:
+        report_job (Awaitable[Any]): Coroutine that renders and uploads the report
+        report_url (Optional[str]): Blob URL the report is uploaded to; when given, the
+            outcome of the job can be awaited with wait_for_report()
+
+    Related Files:
+        - agents/director_agent.py: Enqueues the conversation report after synthesis
+        - report_worker(): Drains the queue
+    """
+    result = asyncio.get_running_loop().create_future()
+    if report_url is not None:
+        _report_results[report_url] = result
+        if len(_report_results) > max_tracked_reports:
+            _report_results.popitem(last=False)
+    report_queue.put_nowait((report_job, result))
+
+async def wait_for_report(report_url: str) -> bool:
+    """
+    Wait until the report queued for report_url has been uploaded.
+
+    Args:
+        report_url (str): URL returned by report_blob_url() and passed to enqueue_report()
+
+    Returns:
+        bool: True once the report is uploaded; False if its job failed or is not tracked
+
+    Related Files:
+        - app.py: Only caches a response (and its report URL) after this returns True
+    """
+    result = _report_results.get(report_url)
+    if result is None:
+        return False
+    try:
+        return await asyncio.shield(result)
+    finally:
+        _report_results.pop(report_url, None)
+
+def start_report_workers() -> List["asyncio.Task[None]"]:
+    """
+    Start report_worker_count report workers.
+
+    Related Files:
+        - app.py: Calls this in lifespan() on startup
+    """
+    return [asyncio.create_task(report_worker()) for _ in range(report_worker_count)]
+
+async def stop_report_workers(report_worker_tasks: List["asyncio.Task[None]"]) -> None:
+    """
+    Let the queued report jobs finish (up to report_drain_timeout seconds), then stop the workers.
+
+    The URLs of queued reports have already been returned to users, so cancelling the
+    workers straight away would leave those links pointing at blobs that never appear.
+
+    Related Files:
+        - app.py: Calls this in lifespan() on shutdown, before the PDF process pool is stopped
+    """
+    try:
+        await asyncio.wait_for(report_queue.join(), report_drain_timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Stopping with %d conversation reports still queued", report_queue.qsize())
+
+    for task in report_worker_tasks:
+        task.cancel()
+    await asyncio.gather(*report_worker_tasks, return_exceptions=True)
+
+async def report_worker() -> None:
+    """
+    Background worker that runs queued report jobs one at a time.
+
+    Several run side by side (see start_report_workers()); failures are logged and do
+    not stop the worker.
+
+    Related Files:
+        - app.py: Starts the workers on startup and stops them on shutdown
+        - enqueue_report(): Adds jobs to the queue
+    """
+    while True:
+        report_job, result = await report_queue.get()
+        try:
+            await report_job
+            result.set_result(True)
+        except Exception as e:
+            logger.exception("Failed to generate conversation report: %s", e)
+        finally:
+            # failed or cancelled on shutdown
+            if not result.done():
+                result.set_result(False)
+            report_queue.task_done()
+
 async def conversation_with_context_to_pdf(
     user_prompt: str,
-    agents_total_conversation_history: List[Dict[str, str]],
+    qa_pairs: List[Dict[str, str]],
     all_context_chunks: List[str],
     direcotr_response: str,
     output_dir: str = "./conversation_pdfs"
@@ -343,7 +504,7 @@ async def conversation_with_context_to_pdf(
     
     Args:
         user_prompt (str): The original user question
-        agents_total_conversation_history (List[Dict[str, str]]): Complete conversation history
+        qa_pairs (List[Dict[str, str]]): Sub-question/answer pairs of the conversation
         all_context_chunks (List[str]): All context chunks gathered by worker agents
         direcotr_response (str): Final synthesized response from director agent
         output_dir (str): Directory path for saving PDF files (default: "./conversation_pdfs")
@@ -351,11 +512,13 @@ async def conversation_with_context_to_pdf(
     Returns:
         str: File path to the generated PDF document
     """
-    return await asyncio.to_thread(_conversation_with_context_to_pdf_sync, user_prompt, agents_total_conversation_history, all_context_chunks, direcotr_response, output_dir)
+    return await asyncio.get_running_loop().run_in_executor(
+        get_pdf_process_pool(), _conversation_with_context_to_pdf_sync, user_prompt, qa_pairs, all_context_chunks, direcotr_response, output_dir
+    )
 
 def _conversation_with_context_to_pdf_sync(
     user_prompt: str,
-    agents_total_conversation_history: List[Dict[str, str]],
+    qa_pairs: List[Dict[str, str]],
     all_context_chunks: List[str],
     direcotr_response: str,
     output_dir: str
@@ -370,7 +533,7 @@ def _conversation_with_context_to_pdf_sync(
     
     Args:
         user_prompt (str): The original question from the user
-        agents_total_conversation_history (List[Dict[str, str]]): Full conversation history
+        qa_pairs (List[Dict[str, str]]): Sub-question/answer pairs of the conversation
         all_context_chunks (List[str]): Context chunks provided by worker agents
         direcotr_response (str): Final response from the director agent
         output_dir (str): Directory for saving the PDF file
@@ -394,50 +557,30 @@ def _conversation_with_context_to_pdf_sync(
     filename = f"Conversation_with_context_{timestamp}.pdf"
     filepath = os.path.join(output_dir, filename)
     doc = SimpleDocTemplate(filepath, pagesize=letter)
-    styles = getSampleStyleSheet()
-    section_title_style = styles["Heading2"]
-    normal_style = styles["BodyText"]
-    answer_style = ParagraphStyle(
-        'AnswerStyle',
-        parent=styles['BodyText'],
-        spaceBefore=6,
-        spaceAfter=12,
-        leftIndent=20,
-        fontSize=10
-    )
+    section_title_style = _STYLES["Heading2"]
+    normal_style = _STYLES["BodyText"]
     story = []
     # User Prompt
     story.append(Paragraph("User Prompt", section_title_style))
     story.append(Paragraph(markdown_to_reportlab(user_prompt), normal_style))
-    story.append(Spacer(1, 0.2*inch))
+    story.append(_ITEM_SPACER)
     # Agents Conversation History (with sub-question numbering)
     story.append(Paragraph("Agents Conversation History", section_title_style))
-    subq_counter = 1
-    for item in agents_total_conversation_history:
-        role = item.get('role', '')
-        content = item.get('content', '')
-        if role == 'manager_agent':
-            story.append(Paragraph(f"<b>Sub-question {subq_counter}:</b> {markdown_to_reportlab(content)}", answer_style))
-            subq_counter += 1
-        else:
-            story.append(Paragraph(f"<b>{role}:</b> {markdown_to_reportlab(content)}", answer_style))
-    story.append(Spacer(1, 0.2*inch))
-    # All Context Chunks (grouped by sub-question, 10 per sub-question)
+    for i, pair in enumerate(qa_pairs, 1):
+        story.append(Paragraph(f"<b>Sub-question {i}:</b> {markdown_to_reportlab(pair['question'])}", _ANSWER_STYLE))
+        story.append(Paragraph(f"<b>worker_agent:</b> {markdown_to_reportlab(pair['answer'])}", _ANSWER_STYLE))
+    story.append(_ITEM_SPACER)
+    # All Context Chunks (deduplicated across sub-questions by agentic.py, so they
+    # are listed as one numbered list rather than in fixed groups of 10)
     story.append(Paragraph("All Context Chunks", section_title_style))
-    num_subqs = (len(all_context_chunks) + 9) // 10
-    for subq_idx in range(num_subqs):
-        start_idx = subq_idx * 10
-        end_idx = min((subq_idx + 1) * 10, len(all_context_chunks))
-        story.append(Paragraph(f"Sub-question {subq_idx+1} Chunks", styles["Heading4"]))
-        for chunk_idx, chunk in enumerate(all_context_chunks[start_idx:end_idx], 1):
-            story.append(Paragraph(f"Chunk {chunk_idx}", styles["Heading5"]))
-            story.append(Paragraph(markdown_to_reportlab(chunk), answer_style))
-        story.append(Spacer(1, 0.1*inch))
-    story.append(Spacer(1, 0.2*inch))
+    for chunk_idx, chunk in enumerate(all_context_chunks, 1):
+        story.append(Paragraph(f"Chunk {chunk_idx}", _STYLES["Heading5"]))
+        story.append(Paragraph(markdown_to_reportlab(chunk), _ANSWER_STYLE))
+    story.append(_ITEM_SPACER)
     # Director Response
     story.append(Paragraph("Director Response", section_title_style))
-    story.append(Paragraph(markdown_to_reportlab(direcotr_response), answer_style))
-    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph(markdown_to_reportlab(direcotr_response), _ANSWER_STYLE))
+    story.append(_ITEM_SPACER)
     doc.build(story)
     return filepath
 
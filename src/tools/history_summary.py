@@ -0,0 +1,117 @@
+"""
+History Summary Tool Module
+
+This module keeps a short summary of the conversation turns that no longer fit in
+the history token budget, so long conversations keep their earlier context without
+sending every previous turn to each model call.
+
+Key Features:
+- Summaries generated in the background with a small deployment, off the request path
+- One summary per conversation, kept in a bounded in-process LRU
+- Opt-in via AZURE_OPENAI_SUMMARY_DEPLOYMENT; without it dropped turns are simply dropped
+
+Dependencies:
+- Azure OpenAI: Summary generation
+
+Related Files:
+- agentic.py: Adds the summary to the trimmed history in manager()
+- tools/tokens.py: trim_history_to_budget() decides which turns are dropped
+"""
+
+import os
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Set
+from openai import AsyncAzureOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Deployment used for summaries (e.g. gpt-4o-mini); summarization is off when unset
+summary_deployment = os.getenv("AZURE_OPENAI_SUMMARY_DEPLOYMENT")
+summary_max_tokens = 200
+max_cached_summaries = 1024
+
+SUMMARY_SYSTEM_PROMPT = (
+    "Summarize the following conversation between a user and an ESG research assistant "
+    "in a few sentences. Keep company names, metrics, years and figures."
+)
+
+# conversation_id -> summary of the turns dropped at its latest request
+_summaries: "OrderedDict[str, str]" = OrderedDict()
+# Running summary tasks, referenced so they are not garbage collected mid-flight
+_summary_tasks: Set[asyncio.Task] = set()
+
+def with_history_summary(
+    llm_client: AsyncAzureOpenAI,
+    conversation_id: str,
+    conversation_history: List[Dict[str, str]],
+    trimmed_history: List[Dict[str, str]]
+) -> List[Dict[str, str]]:
+    """
+    Prefix the trimmed history with a summary of the turns that were dropped from it.
+
+    The summary of the dropped turns is generated in the background and used from the
+    next request on, so this never waits for a model call. The dropped part of the
+    window only grows by one turn per request, so the previous summary covers
+    nearly all of it.
+
+    Args:
+        llm_client (AsyncAzureOpenAI): Azure OpenAI client for the summary call
+        conversation_id (str): Overall conversation identifier
+        conversation_history (List[Dict[str, str]]): History before trimming, oldest first
+        trimmed_history (List[Dict[str, str]]): Result of trim_history_to_budget()
+
+    Returns:
+        List[Dict[str, str]]: trimmed_history, preceded by a system summary message when
+            turns were dropped and a summary is available
+
+    Related Files:
+        - agentic.py: Calls this in manager() right after trimming
+    """
+    dropped = conversation_history[:len(conversation_history) - len(trimmed_history)]
+    if not summary_deployment or not dropped:
+        return trimmed_history
+
+    _schedule_summary(llm_client, conversation_id, dropped)
+
+    summary = _summaries.get(conversation_id)
+    if summary is None:
+        return trimmed_history
+    _summaries.move_to_end(conversation_id)
+    return [{"role": "system", "content": f"Summary of the earlier conversation: {summary}"}, *trimmed_history]
+
+def _schedule_summary(llm_client: AsyncAzureOpenAI, conversation_id: str, dropped: List[Dict[str, str]]) -> None:
+    """
+    Start a background task summarizing the dropped turns of a conversation.
+    """
+    task = asyncio.create_task(_summarize(llm_client, conversation_id, dropped))
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+
+async def _summarize(llm_client: AsyncAzureOpenAI, conversation_id: str, dropped: List[Dict[str, str]]) -> None:
+    """
+    Summarize the dropped turns with the summary deployment and cache the result.
+
+    Failures are logged and ignored; the request that scheduled this has already
+    been answered.
+    """
+    transcript = "\n".join(f"{message['role']}: {message['content']}" for message in dropped)
+    try:
+        completion = await llm_client.chat.completions.create(
+            model=summary_deployment,
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": transcript}
+            ],
+            max_tokens=summary_max_tokens,
+            temperature=0.2
+        )
+    except Exception as e:
+        logger.warning("Could not summarize conversation history: %s", e)
+        return
+
+    _summaries[conversation_id] = completion.choices[0].message.content
+    _summaries.move_to_end(conversation_id)
+    if len(_summaries) > max_cached_summaries:
+        _summaries.popitem(last=False)
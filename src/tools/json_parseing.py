@@ -13,20 +13,28 @@ Key Responsibilities:
 
 Dependencies:
 - Python standard library: re, json
+- orjson: Fast path for responses that are plain JSON
 
 Related Files:
-- agentic.py: Primary consumer for parsing manager agent responses
-- Used for extracting sub-questions and company names from LLM outputs
+- agents/worker_agent.py: Parses batched worker answers
 - Enables structured data flow in the agentic workflow
 
 External Dependencies:
-- None (uses only Python standard library)
+- orjson
 """
 
 import re
+import logging
 import json
+import orjson
 from typing import Dict, List, Optional, Tuple, Any, Union
 
+logger = logging.getLogger(__name__)
+
+# Compiled once at import: code fence around the JSON (```json ... ``` or ``` ... ```)
+_FENCE_RE = re.compile(r'```(?:json)?(.*?)```', re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
+
 def parse_json_from_model_response(
     raw_response: str, 
     required_keys: Optional[List[str]] = None
@@ -56,8 +64,8 @@ def parse_json_from_model_response(
         
     Workflow:
         1. Attempt to extract JSON from code blocks (```json or ```)
-        2. Fall back to regex pattern matching for braces
-        3. Parse extracted JSON string
+        2. Parse the text directly with orjson, otherwise decode from the first opening brace with JSONDecoder.raw_decode()
+        3. Fall back to parsing the whole string
         4. Validate required keys if specified
         5. Return parsed data or error message
         
@@ -85,30 +93,31 @@ def parse_json_from_model_response(
     try:
         # First, try to find JSON in code blocks (```json or ```)
         # This handles the most common LLM response format
-        json_matches = re.findall(r'```(?:json)?(.*?)```', raw_response, re.DOTALL)
-        if json_matches:
-            cleaned_json = json_matches[0].strip()
-        else:
-            # If no code blocks, try to extract JSON based on braces
-            # This handles cases where JSON is embedded in plain text
-            json_pattern = re.compile(r'({.*})', re.DOTALL)
-            match = json_pattern.search(raw_response)
-            if match:
-                cleaned_json = match.group(1).strip()
+        fence_match = _FENCE_RE.search(raw_response)
+        json_text = fence_match.group(1) if fence_match else raw_response
+
+        try:
+            # Structured outputs make the whole text plain JSON, which orjson parses
+            # several times faster than the stdlib
+            parsed_json = orjson.loads(json_text)
+        except orjson.JSONDecodeError:
+            # Decode from the first brace onwards in a single pass; raw_decode stops at the
+            # end of the JSON object, so any prose after it is ignored without a regex scan
+            start = json_text.find("{")
+            if start != -1:
+                parsed_json, _ = _JSON_DECODER.raw_decode(json_text, start)
             else:
                 # Fall back to the original content if we can't identify JSON pattern
                 # This is a last resort attempt to parse the entire response as JSON
-                cleaned_json = raw_response
-                print("fall back to the original content could not find json pattern")
+                logger.debug("fall back to the original content could not find json pattern")
+                parsed_json = json.loads(json_text)
     
-        # print(f"Extracted JSON: {cleaned_json}")
-        print("- extracted manager response json")
-        
-        # Parse the JSON response using Python's json library
-        parsed_json = json.loads(cleaned_json)
+        logger.debug("extracted manager response json")
         
         # Verify the expected keys are present if required_keys provided
         # This validation ensures the LLM provided all necessary fields
+        if not isinstance(parsed_json, dict):
+            raise ValueError("JSON response is not an object")
         if required_keys and not all(key in parsed_json for key in required_keys):
             missing_keys = [key for key in required_keys if key not in parsed_json]
             raise ValueError(f"Missing required keys in JSON response: {missing_keys}")
@@ -117,7 +126,7 @@ def parse_json_from_model_response(
         return parsed_json, None
         
     except (json.JSONDecodeError, ValueError) as e:
-        print(f"Error parsing JSON: {e}")
+        logger.warning("Error parsing JSON: %s", e)
         # Return the error so calling code can handle it
         # This enables fallback behavior in agentic.py when JSON parsing fails
         return None, str(e)
\ No newline at end of file
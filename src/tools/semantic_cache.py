@@ -0,0 +1,647 @@
+"""
+Semantic Cache Tool Module
+
+This module provides an in-process semantic response cache for the ESGAI system.
+User prompts are embedded with Azure OpenAI and compared against previously answered
+prompts using cosine similarity, so that semantically equivalent questions can be
+answered without re-running the full Manager -> Worker -> Director pipeline.
+
+Key Features:
+- Azure OpenAI embeddings for prompt similarity
+- NumPy cosine-similarity lookup over all cached prompt embeddings
+- Entries scoped by a hash of the conversation context, so follow-up questions
+  only match answers given in the same conversational context
+- MongoDB persistence so the cache survives restarts, purged by a TTL index
+- Optional random-projection LSH pre-filter, so large caches only compare a few candidates
+- Exact-match LRU tier for repeated prompts, checked before any embedding call;
+  prompts are normalized (case, whitespace) and stored as SHA-1 keys with a TTL
+
+Dependencies:
+- NumPy: Embedding storage and similarity computation
+- Azure OpenAI: Embedding generation
+- MongoDB: Persistence of cache entries
+
+Related Files:
+- app.py: Checks the cache in agentic_flow() before invoking the manager agent
+- agentic.py: Manager workflow that is skipped on cache hits
+"""
+
+import os
+import re
+import time
+import asyncio
+import logging
+import uuid
+import hashlib
+import numpy as np
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from openai import AsyncAzureOpenAI
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DESCENDING
+
+logger = logging.getLogger(__name__)
+
+# Azure OpenAI embedding deployment used for cache keys
+embedding_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-3-small")
+
+# Scope of prompts asked without any previous conversation
+STANDALONE_SCOPE = ""
+
+# Years, scope numbers and other figures, and capitalized words (company names, acronyms)
+_NUMBER_RE = re.compile(r"\d+")
+_NAME_RE = re.compile(r"\b[A-Z][\w&.-]*")
+
+def context_scope(conversation_history: List[Dict[str, str]]) -> str:
+    """
+    Hash the conversation context a prompt was asked in.
+
+    A follow-up question means something different depending on the conversation
+    that came before it, so cache entries only match prompts with the same scope.
+
+    Args:
+        conversation_history (List[Dict[str, str]]): role/content messages from conv_history()
+
+    Returns:
+        str: STANDALONE_SCOPE for an empty history, otherwise a SHA-1 hex digest
+    """
+    if not conversation_history:
+        return STANDALONE_SCOPE
+
+    digest = hashlib.sha1()
+    for message in conversation_history:
+        digest.update(message["role"].encode("utf-8"))
+        digest.update(b"\x1f")
+        digest.update(message["content"].encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+def prompt_scope(prompt: str, scope: str = STANDALONE_SCOPE) -> str:
+    """
+    Narrow a context scope to the companies and figures a prompt mentions.
+
+    "Scope 1 emissions of HPCL in FY23" and "Scope 1 emissions of IOCL in FY22" embed
+    far above the semantic threshold but need different answers, so semantic entries
+    only match prompts with the same numbers and the same capitalized words (company
+    names and acronyms). The first word is left out, since it is capitalized in any
+    sentence. A paraphrase that changes these only costs a cache miss.
+
+    Args:
+        prompt (str): User prompt
+        scope (str): Conversation context of the prompt (see context_scope())
+
+    Returns:
+        str: Scope key for the semantic tier
+    """
+    numbers = sorted(set(_NUMBER_RE.findall(prompt)))
+    words = prompt.split(None, 1)
+    names = sorted({name.lower() for name in _NAME_RE.findall(words[1])}) if len(words) > 1 else []
+    return f"{scope}|{','.join(numbers)}|{','.join(names)}"
+
+def prompt_key(prompt: str) -> str:
+    """
+    Normalize a prompt and hash it into a fixed-size exact-cache key.
+
+    Case and runs of whitespace are ignored, so "What is X?" and " what  is x? "
+    share one entry.
+
+    Args:
+        prompt (str): User prompt
+
+    Returns:
+        str: SHA-1 hex digest of the normalized prompt
+    """
+    normalized = " ".join(prompt.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+async def embed_text(llm_client: AsyncAzureOpenAI, text: str) -> np.ndarray:
+    """
+    Generate an embedding vector for a piece of text.
+
+    Args:
+        llm_client (AsyncAzureOpenAI): Azure OpenAI client for embedding requests
+        text (str): Text to embed (typically the user's prompt)
+
+    Returns:
+        np.ndarray: 1-D float32 embedding vector (1536 dims for text-embedding-3-small)
+
+    Related Files:
+        - app.py: Embeds the user prompt before cache lookup
+    """
+    response = await llm_client.embeddings.create(model=embedding_deployment, input=text)
+    return np.asarray(response.data[0].embedding, dtype=np.float32)
+
+class SemanticCache:
+    """
+    In-process semantic cache mapping prompt embeddings to previously generated results.
+
+    Embeddings are kept in a single preallocated NumPy matrix used as a ring buffer,
+    so a lookup is one matrix-vector product followed by an argmax, and storing an
+    entry overwrites the oldest row instead of copying the whole matrix.
+
+    With lsh_tables > 0, every entry is also hashed into random-projection LSH
+    buckets (one sign bit per projection, lsh_bits projections per table). A lookup
+    then computes exact cosine only for the entries sharing a bucket with the query
+    in at least one table, instead of scanning the whole matrix. Similar embeddings
+    share a bucket with high probability, so hits above a ~0.9 threshold are rarely
+    missed; lsh_bits trades candidates per lookup against that recall.
+
+    With pca_components > 0, the first pca_fit_size embeddings are used to fit a PCA
+    projection (NumPy SVD, in a worker thread), after which every embedding is stored
+    and compared in the reduced space, cutting memory and cosine work by
+    dim / pca_components. The projection is fitted on the raw, uncentred embeddings:
+    centring would remove the mean direction that all embeddings share, which carries
+    much of their norm. Scores divide the reduced dot product by the full-space norms,
+    so dropping dimensions cannot inflate them the way reduced-space cosines would,
+    and the threshold is recalibrated on the fit sample: the reduced-space threshold is
+    raised above the score of every sample pair the full-space threshold rejects, so
+    the cache never gets looser once the PCA is applied. The fitted projection and
+    threshold are saved to pca_path and loaded from it on restart, unless they were
+    fitted for another embedding dimension, component count or threshold.
+
+    Attributes:
+        threshold (float): Minimum cosine similarity for a cache hit
+        max_entries (int): Maximum number of cached entries (oldest are evicted first)
+        ttl_seconds (Optional[float]): Seconds an entry stays valid; None never expires
+        lsh_tables (int): Number of LSH hash tables; 0 scans every entry
+        lsh_bits (int): Projections (hash bits) per LSH table
+        pca_components (int): Dimensions kept after PCA; 0 stores full embeddings
+        pca_fit_size (int): Number of stored embeddings the PCA is fitted on
+        pca_path (Optional[str]): .npz file the fitted PCA is saved to and loaded from
+
+    Related Files:
+        - app.py: Creates the response cache used by agentic_flow()
+        - agents/worker_agent.py: Creates the sub-question caches used by worker()
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 1000,
+        ttl_seconds: Optional[float] = None,
+        lsh_tables: int = 0,
+        lsh_bits: int = 10,
+        pca_components: int = 0,
+        pca_fit_size: int = 2000,
+        pca_path: Optional[str] = None
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.lsh_tables = lsh_tables
+        self.lsh_bits = lsh_bits
+        self.pca_components = pca_components
+        self.pca_fit_size = min(pca_fit_size, max_entries)
+        self.pca_path = pca_path
+        # Fitted PCA basis (dim, pca_components), and the fit running in a worker thread
+        self._pca_basis: Optional[np.ndarray] = None
+        self._pca_fit_task: Optional[asyncio.Task] = None
+        # Threshold scores are compared against; recalibrated when the PCA is applied
+        self._score_threshold = threshold
+        # Basis loaded from pca_path, checked against the first embedding's dimension
+        self._loaded_pca: Optional[Tuple[np.ndarray, float]] = None
+        if pca_components and pca_path and os.path.exists(pca_path):
+            self._loaded_pca = self._load_pca(pca_path)
+        # Projection matrix (dim, tables * bits), drawn when the matrix is allocated
+        self._projections: Optional[np.ndarray] = None
+        self._bit_weights = (1 << np.arange(lsh_bits)).astype(np.int64)
+        # Per table: bucket key -> slots hashed into it; per slot: its key in every table
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(lsh_tables)]
+        self._slot_keys = np.zeros((max_entries, lsh_tables), dtype=np.int64)
+        # Allocated on the first store, once the embedding dimension is known
+        self._embeddings: Optional[np.ndarray] = None
+        self._norms = np.zeros(max_entries, dtype=np.float32)
+        self._scopes = np.empty(max_entries, dtype=object)
+        self._expires_at = np.full(max_entries, np.inf)
+        self._entries: List[Any] = [None] * max_entries
+        self._count = 0
+        self._next = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def lookup(self, embedding: np.ndarray, scope: str = STANDALONE_SCOPE) -> Optional[Any]:
+        """
+        Return the cached value for the most similar stored embedding, if similar enough.
+
+        Args:
+            embedding (np.ndarray): Query embedding from embed_text()
+            scope (str): Conversation context of the query (see context_scope())
+
+        Returns:
+            Optional[Any]: Cached value on a hit, None on a miss
+        """
+        if not self._count:
+            self.misses += 1
+            return None
+
+        embedding = np.asarray(embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(embedding)
+        embedding = self._reduce(embedding)
+        if query_norm == 0:
+            return None
+
+        if self.lsh_tables:
+            candidates: Set[int] = set()
+            for table, key in zip(self._buckets, self._lsh_keys(embedding)):
+                candidates.update(table.get(int(key), ()))
+            if not candidates:
+                self.misses += 1
+                return None
+            slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        else:
+            slots = np.arange(self._count)
+
+        # cosine = E @ q / (|E| * |q|) for every candidate embedding at once, with the norms
+        # of the full embeddings; entries from a different conversation context can never
+        # match, nor can expired ones
+        cosine = self._embeddings[slots] @ embedding / (self._norms[slots] * query_norm)
+        cosine[self._scopes[slots] != scope] = -1.0
+        if self.ttl_seconds is not None:
+            cosine[self._expires_at[slots] <= time.monotonic()] = -1.0
+        best = int(np.argmax(cosine))
+
+        if cosine[best] >= self._score_threshold:
+            self.hits += 1
+            return self._entries[slots[best]]
+        self.misses += 1
+        return None
+
+    def store(self, embedding: np.ndarray, value: Any, scope: str = STANDALONE_SCOPE) -> None:
+        """
+        Add an embedding and its value to the cache, evicting the oldest entry when full.
+
+        Args:
+            embedding (np.ndarray): Prompt embedding from embed_text()
+            value (Any): Result to return on future hits
+            scope (str): Conversation context of the prompt (see context_scope())
+        """
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        embedding = self._reduce(embedding)
+        if self._embeddings is None:
+            self._allocate(embedding.shape[0])
+
+        # Overwrite the oldest slot once the cache is full
+        slot = self._next
+        if self.lsh_tables and self._count == self.max_entries:
+            self._unindex_slot(slot)
+
+        self._embeddings[slot] = embedding
+        self._norms[slot] = norm
+        self._scopes[slot] = scope
+        self._expires_at[slot] = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else np.inf
+        self._entries[slot] = value
+        if self.lsh_tables:
+            self._index_slot(slot)
+
+        self._next = (slot + 1) % self.max_entries
+        self._count = min(self._count + 1, self.max_entries)
+
+        if self.pca_components and self._pca_basis is None and self._pca_fit_task is None and self._count >= self.pca_fit_size:
+            self._start_pca_fit()
+
+    def _reduce(self, embedding: np.ndarray) -> np.ndarray:
+        """
+        Project an embedding into the PCA space once the PCA is fitted.
+        """
+        if self._loaded_pca is not None:
+            self._check_loaded_pca(embedding.shape[-1])
+        if self._pca_basis is None:
+            return embedding
+        return embedding @ self._pca_basis
+
+    def _allocate(self, dim: int) -> None:
+        """
+        Allocate the embedding matrix (and LSH projections) for dim-dimensional embeddings.
+        """
+        self._embeddings = np.zeros((self.max_entries, dim), dtype=np.float32)
+        if self.lsh_tables:
+            self._projections = np.random.default_rng(0).standard_normal(
+                (dim, self.lsh_tables * self.lsh_bits)
+            ).astype(np.float32)
+
+    def _load_pca(self, path: str) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Read a saved basis and threshold, or None if it was fitted for other settings.
+        """
+        try:
+            with np.load(path) as fitted:
+                basis = fitted["basis"]
+                threshold = float(fitted["threshold"])
+                score_threshold = float(fitted["score_threshold"])
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("Ignoring unreadable PCA file %s: %s", path, e)
+            return None
+
+        if basis.ndim != 2 or basis.shape[1] != self.pca_components or threshold != self.threshold:
+            logger.warning(
+                "Ignoring PCA file %s: fitted for %s components and threshold %s, cache uses %s and %s",
+                path, basis.shape[-1], threshold, self.pca_components, self.threshold
+            )
+            return None
+        return basis, score_threshold
+
+    def _check_loaded_pca(self, dim: int) -> None:
+        """
+        Apply the basis loaded from pca_path if it matches the embedding dimension.
+
+        A basis saved for another embedding model would make every projection fail,
+        so it is dropped and refitted instead.
+        """
+        basis, score_threshold = self._loaded_pca
+        self._loaded_pca = None
+        if basis.shape[0] != dim:
+            logger.warning(
+                "Ignoring PCA file %s: fitted for %d-dimensional embeddings, got %d",
+                self.pca_path, basis.shape[0], dim
+            )
+            return
+        self._pca_basis = basis
+        self._score_threshold = score_threshold
+
+    def _start_pca_fit(self) -> None:
+        """
+        Fit the PCA on a copy of the stored embeddings in a worker thread.
+
+        The SVD of a few thousand embeddings takes long enough to stall every request
+        on the event loop, so it runs in a thread and the cache keeps storing and
+        answering in the full space until _apply_pca() swaps the projection in.
+        Outside an event loop (scripts) the fit runs inline.
+        """
+        sample = self._embeddings[:self._count].copy()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._apply_pca(*_fit_pca(sample, self.pca_components, self.threshold))
+            return
+
+        self._pca_fit_task = loop.create_task(
+            asyncio.to_thread(_fit_pca, sample, self.pca_components, self.threshold)
+        )
+        self._pca_fit_task.add_done_callback(self._on_pca_fitted)
+
+    def _on_pca_fitted(self, task: "asyncio.Task[Tuple[np.ndarray, float]]") -> None:
+        """
+        Apply the PCA fitted in the worker thread; a failed fit is retried on a later store.
+        """
+        self._pca_fit_task = None
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning("PCA fit for the semantic cache failed: %s", task.exception())
+            return
+        self._apply_pca(*task.result())
+
+    def _apply_pca(self, basis: np.ndarray, score_threshold: float) -> None:
+        """
+        Switch to the fitted PCA: re-project the stored embeddings and re-index the LSH buckets.
+
+        The stored norms are those of the full embeddings and stay as they are.
+        """
+        count = self._count
+        self._pca_basis = basis
+        self._score_threshold = score_threshold
+        reduced = self._reduce(self._embeddings[:count])
+        self._allocate(self.pca_components)
+        self._embeddings[:count] = reduced
+        if self.lsh_tables:
+            self._buckets = [{} for _ in range(self.lsh_tables)]
+            for slot in range(count):
+                self._index_slot(slot)
+
+        if self.pca_path:
+            np.savez(
+                self.pca_path, basis=basis, threshold=self.threshold, score_threshold=score_threshold
+            )
+
+    def _index_slot(self, slot: int) -> None:
+        """
+        Add a stored slot to its LSH bucket in every table.
+        """
+        self._slot_keys[slot] = self._lsh_keys(self._embeddings[slot])
+        for table, key in zip(self._buckets, self._slot_keys[slot]):
+            table.setdefault(int(key), set()).add(slot)
+
+    def _unindex_slot(self, slot: int) -> None:
+        """
+        Remove a slot that is about to be overwritten from its LSH buckets.
+        """
+        for table, key in zip(self._buckets, self._slot_keys[slot]):
+            bucket = table[int(key)]
+            bucket.discard(slot)
+            if not bucket:
+                del table[int(key)]
+
+    def _lsh_keys(self, embedding: np.ndarray) -> np.ndarray:
+        """
+        Hash an embedding to one bucket key per LSH table (the sign bits of its projections).
+        """
+        bits = (embedding @ self._projections > 0).reshape(self.lsh_tables, self.lsh_bits)
+        return bits.astype(np.int64) @ self._bit_weights
+
+def _pca_basis(embeddings: np.ndarray, components: int) -> np.ndarray:
+    """
+    Principal axes of the (uncentred) embeddings, as a (dim, components) projection matrix.
+    """
+    # Right singular vectors of the data matrix are its principal axes
+    _, _, vt = np.linalg.svd(embeddings, full_matrices=False)
+    return vt[:components].T.astype(np.float32)
+
+def _score_threshold(embeddings: np.ndarray, basis: np.ndarray, threshold: float, block: int = 512) -> float:
+    """
+    Lowest reduced-space threshold that admits no pair of the embeddings the full-space threshold rejects.
+
+    Scores are computed as in SemanticCache.lookup(): reduced dot product over full norms.
+    Pairs are scored block by block, so memory stays at block * len(embeddings) floats.
+    """
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = embeddings / np.where(norms == 0, 1, norms)
+    reduced = unit @ basis
+    calibrated = threshold
+    for start in range(0, len(unit), block):
+        full = unit[start:start + block] @ unit.T
+        scores = reduced[start:start + block] @ reduced.T
+        # An embedding paired with itself is never rejected
+        rows = np.arange(full.shape[0])
+        full[rows, start + rows] = np.inf
+        rejected = scores[full < threshold]
+        if rejected.size:
+            # Just above the best rejected score, since hits need score >= threshold
+            calibrated = max(calibrated, float(np.nextafter(rejected.max(), np.float32(np.inf))))
+    return calibrated
+
+def _fit_pca(embeddings: np.ndarray, components: int, threshold: float) -> Tuple[np.ndarray, float]:
+    """
+    Fit the PCA basis and recalibrate the threshold for it (see _score_threshold()).
+    """
+    basis = _pca_basis(embeddings, components)
+    return basis, _score_threshold(embeddings, basis, threshold)
+
+class ExactPromptCache:
+    """
+    In-process LRU cache mapping (context scope, prompt) to previously generated results.
+
+    Retries and page refreshes resend the exact same prompt; this tier answers those
+    with one dict lookup, before the embedding call of the semantic tier. Prompts are
+    keyed by prompt_key(), and entries expire after ttl_seconds.
+
+    Attributes:
+        max_entries (int): Maximum number of cached entries (least recently used are evicted)
+        ttl_seconds (float): Seconds an entry stays valid after it was stored
+        hits (int): Number of lookups that returned a cached value
+        misses (int): Number of lookups that did not
+
+    Related Files:
+        - app.py: Checked first in agentic_flow(), statistics exposed on /cache/stats
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # (scope, prompt key) -> (monotonic expiry time, value)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, prompt: str, scope: str = STANDALONE_SCOPE) -> Optional[Any]:
+        """
+        Return the cached value for exactly this prompt in this context, if any.
+
+        Args:
+            prompt (str): User prompt
+            scope (str): Conversation context of the prompt (see context_scope())
+
+        Returns:
+            Optional[Any]: Cached value on a hit, None on a miss
+        """
+        key = (scope, prompt_key(prompt))
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def store(self, prompt: str, value: Any, scope: str = STANDALONE_SCOPE) -> None:
+        """
+        Add a result to the cache, evicting the least recently used entry when full.
+
+        Args:
+            prompt (str): User prompt
+            value (Any): Result to return on future hits
+            scope (str): Conversation context of the prompt (see context_scope())
+        """
+        key = (scope, prompt_key(prompt))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+async def ensure_semantic_cache_indexes(collection: AsyncIOMotorCollection, ttl_seconds: Optional[float]) -> None:
+    """
+    Create the timestamp index used by load_semantic_cache() and the TTL index that
+    purges persisted entries once they can no longer be served.
+
+    A TTL index on "timestamp" serves both. Cosmos DB (RU) only accepts TTL indexes
+    on its "_ts" system field, so when that is rejected "timestamp" gets a plain
+    index for the sort and the TTL index goes on "_ts" instead. Failures are logged
+    and ignored, like ensure_chat_history_indexes() in tools/conv_handler.py.
+
+    Args:
+        collection (AsyncIOMotorCollection): MongoDB collection holding cache entries
+        ttl_seconds (Optional[float]): Lifetime of a cache entry; None keeps entries forever
+
+    Related Files:
+        - app.py: Calls this on application startup
+    """
+    if ttl_seconds is not None:
+        try:
+            await collection.create_index("timestamp", expireAfterSeconds=int(ttl_seconds))
+            return
+        except Exception as e:
+            logger.warning("Could not create semantic cache TTL index on timestamp: %s", e)
+
+    try:
+        await collection.create_index([("timestamp", DESCENDING)])
+    except Exception as e:
+        logger.warning("Could not create semantic cache timestamp index: %s", e)
+
+    if ttl_seconds is not None:
+        try:
+            await collection.create_index("_ts", expireAfterSeconds=int(ttl_seconds))
+        except Exception as e:
+            logger.warning("Could not create semantic cache TTL index on _ts: %s", e)
+
+async def load_semantic_cache(cache: SemanticCache, collection: AsyncIOMotorCollection) -> None:
+    """
+    Warm a SemanticCache with the most recent entries persisted in MongoDB.
+
+    Only the newest max_entries entries that have not outlived the cache's TTL are
+    read, and they are stored oldest first so the newest survive in the ring buffer.
+
+    Args:
+        cache (SemanticCache): Cache to populate
+        collection (AsyncIOMotorCollection): MongoDB collection holding cache entries
+
+    Related Files:
+        - app.py: Calls this on application startup
+    """
+    query: Dict[str, Any] = {}
+    if cache.ttl_seconds is not None:
+        query["timestamp"] = {"$gte": datetime.now(timezone.utc) - timedelta(seconds=cache.ttl_seconds)}
+
+    docs = await (
+        collection.find(query, {"embedding": 1, "value": 1, "scope": 1, "_id": 0})
+        .sort("timestamp", DESCENDING)
+        .limit(cache.max_entries)
+        .to_list(length=None)
+    )
+
+    for doc in reversed(docs):
+        cache.store(np.asarray(doc["embedding"], dtype=np.float32), doc["value"], doc.get("scope", STANDALONE_SCOPE))
+
+async def persist_semantic_cache_entry(
+    collection: AsyncIOMotorCollection,
+    prompt: str,
+    embedding: np.ndarray,
+    value: Any,
+    scope: str = STANDALONE_SCOPE
+) -> None:
+    """
+    Persist a cache entry to MongoDB so it can be reloaded by load_semantic_cache().
+
+    Args:
+        collection (AsyncIOMotorCollection): MongoDB collection holding cache entries
+        prompt (str): Prompt the entry was created for (kept for inspection)
+        embedding (np.ndarray): Prompt embedding
+        value (Any): BSON-serializable cached result
+        scope (str): Conversation context of the prompt (see context_scope())
+
+    Database Schema:
+        - id: unique entry identifier
+        - prompt: the cached prompt
+        - embedding: prompt embedding as a list of floats
+        - value: cached result
+        - scope: conversation context hash ("" for standalone prompts)
+        - timestamp: UTC timestamp (BSON date) of insertion
+    """
+    cache_doc = {
+        "id": uuid.uuid4().hex,
+        "prompt": prompt,
+        "embedding": embedding.tolist(),
+        "value": value,
+        "scope": scope,
+        "timestamp": datetime.now(timezone.utc)
+    }
+    await collection.insert_one(cache_doc)
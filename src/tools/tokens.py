@@ -0,0 +1,133 @@
+"""
+Token Counting Tool Module
+
+This module provides tiktoken-based token counting for the ESGAI system. The
+tokenizer is loaded once per process, on startup (see app.py lifespan()). When it
+cannot be loaded (tiktoken downloads its BPE file on first use, which fails on
+hosts without outbound access), budgets fall back to an estimate of
+chars_per_token characters per token.
+
+Key Features:
+- Single cached tiktoken encoding for the deployed chat model family
+- Token encoding and counting helpers, with a character-based fallback
+- Token-budget trimming of conversation history (oldest turns dropped first)
+
+Dependencies:
+- tiktoken: Tokenizer matching the Azure OpenAI chat models
+
+Related Files:
+- agentic.py: Trims the conversation history sent to the models
+- agents/worker_agent.py: Truncates the retrieved context of a sub-question
+- app.py: Loads the encoding on startup
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Model family used to pick the tokenizer (gpt-4o -> o200k_base)
+tokenizer_model = "gpt-4o"
+
+# Tokens the chat format adds around every message (role and separators)
+message_overhead_tokens = 4
+
+# Estimate used when the encoding cannot be loaded (English text averages ~4 characters per token)
+chars_per_token = 4
+
+@lru_cache(maxsize=1)
+def get_encoding() -> Optional[tiktoken.Encoding]:
+    """
+    Return the tiktoken encoding for tokenizer_model, loading it only once.
+
+    Loading may download the BPE file, so app.py calls this in a thread on startup.
+    A failed load is logged and cached as None, so requests fall back to the
+    character estimate instead of retrying the download every time.
+    """
+    try:
+        return tiktoken.encoding_for_model(tokenizer_model)
+    except Exception as e:
+        logger.warning("Could not load the %s tokenizer, estimating tokens from characters: %s", tokenizer_model, e)
+        return None
+
+def encode(text: str) -> List[int]:
+    """
+    Tokenize text with the shared encoding.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        List[int]: Token ids
+
+    Raises:
+        RuntimeError: When the encoding could not be loaded
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        raise RuntimeError(f"The {tokenizer_model} tokenizer is not available")
+    return encoding.encode(text)
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a piece of text.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Number of tokens (estimated from the length without an encoding)
+    """
+    if get_encoding() is None:
+        return -(-len(text) // chars_per_token)
+    return len(encode(text))
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut text down to at most max_tokens tokens, keeping the beginning.
+
+    Args:
+        text (str): Text to truncate
+        max_tokens (int): Token budget
+
+    Returns:
+        str: text itself when it fits, otherwise its first max_tokens tokens
+            (max_tokens * chars_per_token characters without an encoding)
+    """
+    if get_encoding() is None:
+        return text[:max_tokens * chars_per_token]
+
+    tokens = encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return get_encoding().decode(tokens[:max_tokens])
+
+def trim_history_to_budget(conversation_history: List[Dict[str, str]], max_tokens: int) -> List[Dict[str, str]]:
+    """
+    Keep the most recent messages of a conversation that fit in a token budget.
+
+    Messages are counted from the newest backwards and the oldest ones that do not
+    fit are dropped. The result always starts with a user message, so a turn is
+    never cut in half.
+
+    Args:
+        conversation_history (List[Dict[str, str]]): role/content messages, oldest first
+        max_tokens (int): Token budget for the returned messages
+
+    Returns:
+        List[Dict[str, str]]: The newest messages within the budget, oldest first
+    """
+    used_tokens = 0
+    start = len(conversation_history)
+    for index in range(len(conversation_history) - 1, -1, -1):
+        used_tokens += count_tokens(conversation_history[index]["content"]) + message_overhead_tokens
+        if used_tokens > max_tokens:
+            break
+        start = index
+
+    # Don't start on the answer of a turn whose question was dropped
+    while start < len(conversation_history) and conversation_history[start]["role"] != "user":
+        start += 1
+    return conversation_history[start:]
@@ -31,12 +31,51 @@ from azure.search.documents import SearchClient
 import asyncio
 from typing import Tuple, List
 
+def company_filter(company_names: Tuple[str, ...]) -> str:
+    """
+    Build the Azure AI Search title filter for a set of companies.
+
+    Not applied at the moment (see parent_filter in semantic_hybrid_search()).
+
+    Args:
+        company_names (Tuple[str, ...]): Company names, sorted and de-duplicated by agentic.py
+
+    Returns:
+        str: search.in() filter over the companies' document titles
+    """
+    filter_elements = []
+    # Build filters for company-specific documents
+    # Supports both original and uppercase company name variants
+    for company_name in company_names:
+        company_name = company_name.replace(" ", "")
+        # if "LIMITED" or "limited" or "Limited" in company_name:
+        #     company_name = company_name
+        # else:
+        #     company_name = company_name + " Limited"  
+
+        # Generate document title patterns for filtering
+        # Supports both PDF and XML document formats
+        titlename1 = f"{company_name}.xml"
+        titlename2 = f"{company_name}.pdf"
+
+        company_name = company_name.upper()
+
+        titlename11 = f"{company_name}.xml"
+        titlename22 = f"{company_name}.pdf"
+
+        filter_elements.append(titlename1)
+        filter_elements.append(titlename2)
+        filter_elements.append(titlename11)
+        filter_elements.append(titlename22)
+
+    return f"search.in(title, '{','.join(filter_elements)}')"
+
 #search.in this is a strict filter only gives reselts with the exact match
 async def semantic_hybrid_search(
     query: str,
     search_client: SearchClient,
     top: int = 10,
-    company_names: list[str] = []
+    company_names: Tuple[str, ...] = ()
 ) -> Tuple[List[str], List[str]]:
     """
     Perform a hybrid search combining vector similarity and text search.
@@ -49,7 +88,7 @@ async def semantic_hybrid_search(
         query (str): The search query (typically a sub-question from manager agent)
         search_client (SearchClient): Azure AI Search client (configured in agentic.py)
         top (int): Maximum number of results to return (default: 10)
-        company_names (list[str]): List of company names for result filtering
+        company_names (Tuple[str, ...]): Company names for result filtering
 
     Returns:
         tuple: (chunks, titles)
@@ -58,7 +97,7 @@ async def semantic_hybrid_search(
             
     Workflow:
         1. Create vector query for semantic similarity
-        2. Build company name filters for targeted results
+        2. Build company name filters for targeted results (currently disabled)
         3. Execute hybrid search with both vector and text queries
         4. Return filtered results as text chunks and source titles
         
@@ -81,41 +120,10 @@ async def semantic_hybrid_search(
         exhaustive=True
     )
 
-    filter_elements = []
     #filtering the results based on the company name and then vector search
-    if company_names and len(company_names) > 0:
-        # Build filters for company-specific documents
-        # Supports both original and uppercase company name variants
-        for company_name in company_names:
-            company_name = company_name.replace(" ", "")
-            # if "LIMITED" or "limited" or "Limited" in company_name:
-            #     company_name = company_name
-            # else:
-            #     company_name = company_name + " Limited"  
-
-            # Generate document title patterns for filtering
-            # Supports both PDF and XML document formats
-            titlename1 = f"{company_name}.xml"
-            titlename2 = f"{company_name}.pdf"
-
-            company_name = company_name.upper()
-
-            titlename11 = f"{company_name}.xml"
-            titlename22 = f"{company_name}.pdf"
-
-            filter_elements.append(titlename1)
-            filter_elements.append(titlename2)
-            filter_elements.append(titlename11)
-            filter_elements.append(titlename22)
-
-        # Create Azure AI Search filter string for company documents
-        filter_string = f"search.in(title, '{','.join(filter_elements)}')"
-        # print("filter_string: ",filter_string)
-        
-        parent_filter = None    #CURRENTLY DISABLED
-
-    else:
-        parent_filter = None
+    # CURRENTLY DISABLED: to re-enable, set parent_filter = company_filter(company_names)
+    # when company_names is not empty
+    parent_filter = None
 
     # 2) Execute a hybrid search: full‐text + vector in one call
     # Use run_in_executor to run the synchronous search method in a thread pool
@@ -1,8 +1,27 @@
 import streamlit as st
 import requests
+import json
+import time
+from requests.adapters import HTTPAdapter
 
-# Backend URL
-WEBHOOK_URL = "http://localhost:5000/chat"
+# Backend URL (Server-Sent Events endpoint, see src/app.py chat_stream())
+WEBHOOK_URL = "http://localhost:5000/chat/stream"
+# (connect, read) timeouts; the read timeout covers the manager/worker phase before the first token
+REQUEST_TIMEOUT = (5, 120)
+# retries for server errors (5xx) only; client errors (4xx) are returned immediately
+MAX_RETRIES = 3
+RETRY_DELAY = 2  # seconds, doubled after every attempt and capped at 60
+
+@st.cache_resource
+def get_session():
+    # streamlit reruns this script on every interaction, so the keep-alive session is
+    # cached across reruns; each chat turn then reuses the pooled connection to the backend
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 # Initialize session state if not already present
 if "messages" not in st.session_state:
@@ -13,15 +32,44 @@ if "pdf_urls" not in st.session_state:
     st.session_state.pdf_urls = {}
 
 def display_chat():
+    pdf_urls = st.session_state.pdf_urls
     for i, message in enumerate(st.session_state.messages):
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
-            # Show additional agent conversation PDF link if available
-            if message["role"] == "user" and i in st.session_state.pdf_urls:
-                pdf_url = st.session_state.pdf_urls[i]
+            # Show additional agent conversation PDF link if available (one dict lookup)
+            pdf_url = pdf_urls.get(i) if message["role"] == "user" else None
+            if pdf_url:
                 st.markdown(f"[researched info⬇️]({pdf_url})", unsafe_allow_html=True)
 
+def post_chat(payload, status):
+    # Retry only server errors with capped exponential backoff; a 4xx means the request
+    # itself is wrong, so retrying it would fail the same way
+    for attempt in range(MAX_RETRIES + 1):
+        response = get_session().post(WEBHOOK_URL, json=payload, stream=True, timeout=REQUEST_TIMEOUT)
+        if response.status_code < 500 or attempt == MAX_RETRIES:
+            return response
+
+        response.close()
+        delay = min(RETRY_DELAY * 2 ** attempt, 60)
+        status.update(label=f"Server error {response.status_code}, retrying in {delay}s ({attempt + 1}/{MAX_RETRIES})...")
+        time.sleep(delay)
+
+def stream_tokens(response, meta):
+    # Parse the SSE stream: the "meta" event fills `meta`, unnamed events carry tokens
+    event = None
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            event = None
+        elif line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            data = json.loads(line[len("data: "):])
+            if event == "meta":
+                meta.update(data)
+            elif event is None:
+                yield data["token"]
+
 # Display chat history
 display_chat()
 
@@ -30,25 +78,29 @@ user_input = st.chat_input("Enter your message here")
 if user_input:
     index = len(st.session_state.messages)  # Track index for PDF linking
     st.session_state.messages.append({"role": "user", "content": user_input})
+    with st.chat_message("user"):
+        st.markdown(user_input)
     
     # Build payload including conversation_id if available
     payload = {"user_prompt": user_input}
     if st.session_state.conversation_id:
         payload["conversation_id"] = st.session_state.conversation_id
     
-    with st.spinner("Looking for relevant stuff..."):
-        response = requests.post(WEBHOOK_URL, json=payload)
-        # print(response.json())
+    with st.status("Looking for relevant stuff...") as status:
+        # The manager and workers run before the first byte; tokens then arrive as they are generated
+        response = post_chat(payload, status)
+        status.update(label="Answering...", state="complete")
     
     if response.status_code == 200:
-        json_response = response.json()
-        ai_message = json_response.get("response", "Sorry, no response was generated.")
-        st.session_state.conversation_id = json_response.get("conversation_id", st.session_state.conversation_id)
+        meta = {}
+        with st.chat_message("assistant"):
+            ai_message = st.write_stream(stream_tokens(response, meta)) or "Sorry, no response was generated."
+        st.session_state.conversation_id = meta.get("conversation_id", st.session_state.conversation_id)
         
         st.session_state.messages.append({"role": "assistant", "content": ai_message})
 
         # Check if agents_conv_pdf_url is available
-        agents_conv_pdf_url = json_response.get("agents_conv_pdf_url")
+        agents_conv_pdf_url = meta.get("agents_conv_pdf_url")
         if agents_conv_pdf_url:
             st.session_state.pdf_urls[index] = agents_conv_pdf_url
     else: